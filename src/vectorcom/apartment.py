@@ -0,0 +1,181 @@
+import logging
+import threading
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, Iterable, Optional
+
+import pythoncom
+import win32com.client
+
+LOG = logging.getLogger("VectorCOM")
+
+_Job = tuple[Future, Callable[..., Any], tuple, dict]
+
+
+class ComApartment:
+    def __init__(self, name: str = "VectorCOM-STA", pumpInterval: float = 0.01):
+        self._pumpInterval = pumpInterval
+        self._queue: SimpleQueue[Optional[_Job]] = SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def isWorkerThread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        future: Future = Future()
+        if self.isWorkerThread:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+        # Checked and queued under the lock, so nothing can be put behind the
+        # stop sentinel where the worker would never pick it up.
+        with self._lock:
+            if self._closed or not self.alive:
+                raise RuntimeError("COM apartment has been shut down")
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if self.isWorkerThread:
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def batch(self, calls: Iterable[Callable[[], Any]]) -> Future:
+        calls = list(calls)
+        return self.submit(lambda: [call() for call in calls])
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        if wait and not self.isWorkerThread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        pythoncom.CoInitialize()
+        try:
+            while True:
+                try:
+                    job = self._queue.get(timeout=self._pumpInterval)
+                except Empty:
+                    pythoncom.PumpWaitingMessages()
+                    continue
+                if job is None:
+                    break
+                future, fn, args, kwargs = job
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as exc:
+                        future.set_exception(exc)
+                pythoncom.PumpWaitingMessages()
+        finally:
+            with self._lock:
+                self._closed = True
+            self._failPending()
+            pythoncom.CoUninitialize()
+            LOG.debug("COM apartment %s stopped", self._thread.name)
+
+    def _failPending(self) -> None:
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except Empty:
+                return
+            if job is not None and job[0].set_running_or_notify_cancel():
+                job[0].set_exception(RuntimeError("COM apartment has been shut down"))
+
+    def __enter__(self) -> "ComApartment":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+def _isDispatch(value: Any) -> bool:
+    return hasattr(value, "_oleobj_")
+
+
+def _wrap(apartment: ComApartment, value: Any) -> Any:
+    if isinstance(value, ComProxy):
+        return value
+    if _isDispatch(value):
+        return ComProxy(apartment, value)
+    if callable(value):
+        return _ComMethod(apartment, value)
+    return value
+
+
+def _unwrap(value: Any) -> Any:
+    return value._target if isinstance(value, ComProxy) else value
+
+
+class _ComMethod:
+    __slots__ = ("_apartment", "_method")
+
+    def __init__(self, apartment: ComApartment, method: Callable[..., Any]) -> None:
+        self._apartment = apartment
+        self._method = method
+
+    def __call__(self, *args, **kwargs) -> Any:
+        args = tuple(_unwrap(arg) for arg in args)
+        kwargs = {key: _unwrap(value) for key, value in kwargs.items()}
+        return self._apartment.call(
+            lambda: _wrap(self._apartment, self._method(*args, **kwargs))
+        )
+
+
+class ComProxy:
+    __slots__ = ("_apartment", "_target")
+
+    def __init__(self, apartment: ComApartment, target: Any) -> None:
+        object.__setattr__(self, "_apartment", apartment)
+        object.__setattr__(self, "_target", target)
+
+    @property
+    def apartment(self) -> ComApartment:
+        return self._apartment
+
+    def __getattr__(self, name: str) -> Any:
+        return self._apartment.call(
+            lambda: _wrap(self._apartment, getattr(self._target, name))
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._apartment.call(setattr, self._target, name, _unwrap(value))
+
+    def __repr__(self) -> str:
+        return f"<ComProxy of {self._target!r}>"
+
+
+def dispatch(
+    progid: str, apartment: Optional[ComApartment] = None, newInstance: bool = False
+) -> Any:
+    factory = win32com.client.DispatchEx if newInstance else win32com.client.Dispatch
+    if apartment is None:
+        return factory(progid)
+    return ComProxy(apartment, apartment.call(factory, progid))
+
+
+def getActiveObject(progid: str, apartment: Optional[ComApartment] = None) -> Any:
+    if apartment is None:
+        return win32com.client.GetActiveObject(progid)
+    return ComProxy(apartment, apartment.call(win32com.client.GetActiveObject, progid))
+
+
+def withEvents(com: Any, events: type) -> Any:
+    if isinstance(com, ComProxy):
+        return com.apartment.call(win32com.client.WithEvents, com._target, events)
+    return win32com.client.WithEvents(com, events)
@@ -0,0 +1,202 @@
+import logging
+import threading
+from collections import deque
+from enum import Enum
+from time import perf_counter
+from typing import Any, Callable, Hashable, Optional
+
+from .common import LatencyStats
+
+LOG = logging.getLogger("VectorCOM")
+
+
+class Overflow(Enum):
+    Block = "block"
+    DropNewest = "drop-newest"
+    DropOldest = "drop-oldest"
+    CallerRuns = "caller-runs"
+
+
+class _Pending:
+    __slots__ = ("callback", "args", "key", "enqueued")
+
+    def __init__(
+        self, callback: Callable[..., Any], args: tuple, key: Optional[Hashable]
+    ) -> None:
+        self.callback = callback
+        self.args = args
+        self.key = key
+        self.enqueued = perf_counter()
+
+
+class CallbackMetrics:
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+        self.maxQueueDepth = 0
+        self.queueDepth = 0
+        self.latency = LatencyStats()
+        self.runtime = LatencyStats()
+
+    def __repr__(self) -> str:
+        return (
+            f"CallbackMetrics(queueDepth={self.queueDepth}, "
+            f"maxQueueDepth={self.maxQueueDepth}, submitted={self.submitted}, "
+            f"executed={self.executed}, coalesced={self.coalesced}, "
+            f"dropped={self.dropped}, failed={self.failed}, "
+            f"latency={self.latency!r}, runtime={self.runtime!r})"
+        )
+
+
+class CallbackExecutor:
+    def __init__(
+        self,
+        maxQueue: int = 1024,
+        overflow: Overflow = Overflow.DropOldest,
+        workers: int = 1,
+        name: str = "VectorCOM-callbacks",
+    ) -> None:
+        if maxQueue < 1:
+            raise ValueError("maxQueue must be at least 1")
+        self.maxQueue = maxQueue
+        self.overflow = overflow
+        self.metrics = CallbackMetrics()
+        self._queue: deque[_Pending] = deque()
+        self._byKey: dict[Hashable, _Pending] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        callback: Callable[..., Any],
+        *args,
+        coalesceKey: Optional[Hashable] = None,
+    ) -> bool:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Callback executor has been shut down")
+            self.metrics.submitted += 1
+            if coalesceKey is not None and coalesceKey in self._byKey:
+                pending = self._byKey[coalesceKey]
+                pending.callback = callback
+                pending.args = args
+                self.metrics.coalesced += 1
+                return True
+            runInline = False
+            if len(self._queue) >= self.maxQueue:
+                match self.overflow:
+                    case Overflow.DropNewest:
+                        self.metrics.dropped += 1
+                        return False
+                    case Overflow.DropOldest:
+                        self._forget(self._queue.popleft())
+                        self.metrics.dropped += 1
+                    case Overflow.Block:
+                        while len(self._queue) >= self.maxQueue and not self._closed:
+                            self._cond.wait()
+                        if self._closed:
+                            raise RuntimeError("Callback executor has been shut down")
+                    case Overflow.CallerRuns:
+                        runInline = True
+            if not runInline:
+                pending = _Pending(callback, args, coalesceKey)
+                self._queue.append(pending)
+                if coalesceKey is not None:
+                    self._byKey[coalesceKey] = pending
+                self._updateDepth()
+                self._cond.notify_all()
+                return True
+        self._execute(_Pending(callback, args, coalesceKey))
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def _forget(self, pending: _Pending) -> None:
+        if pending.key is not None and self._byKey.get(pending.key) is pending:
+            del self._byKey[pending.key]
+
+    def _updateDepth(self) -> None:
+        self.metrics.queueDepth = len(self._queue)
+        self.metrics.maxQueueDepth = max(
+            self.metrics.maxQueueDepth, self.metrics.queueDepth
+        )
+
+    def _execute(self, pending: _Pending) -> None:
+        start = perf_counter()
+        failed = False
+        try:
+            pending.callback(*pending.args)
+        except Exception:
+            failed = True
+            LOG.exception("Callback %r raised", pending.callback)
+        finally:
+            end = perf_counter()
+            with self._cond:
+                self.metrics.executed += 1
+                self.metrics.failed += failed
+                self.metrics.runtime.record(end - start)
+                self.metrics.latency.record(end - pending.enqueued)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                pending = self._queue.popleft()
+                self._forget(pending)
+                self._updateDepth()
+                self._cond.notify_all()
+            self._execute(pending)
+
+    def __enter__(self) -> "CallbackExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+_executor: Optional[CallbackExecutor] = None
+
+
+def setCallbackExecutor(
+    executor: Optional[CallbackExecutor],
+) -> Optional[CallbackExecutor]:
+    # COM event handlers submit here on the thread that has to keep pumping
+    # messages; blocking it on a full queue can deadlock the apartment.
+    if executor is not None and executor.overflow is Overflow.Block:
+        raise ValueError("Overflow.Block is not allowed for COM event callbacks")
+    global _executor
+    previous, _executor = _executor, executor
+    return previous
+
+
+def getCallbackExecutor() -> Optional[CallbackExecutor]:
+    return _executor
+
+
+def dispatchCallback(
+    callback: Callable[..., Any], *args, coalesceKey: Optional[Hashable] = None
+) -> None:
+    executor = _executor
+    if executor is None:
+        callback(*args)
+    else:
+        executor.submit(callback, *args, coalesceKey=coalesceKey)
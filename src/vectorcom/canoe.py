@@ -0,0 +1,162 @@
+import logging
+from types import NotImplementedType
+from typing import Callable, ClassVar, Optional, cast
+
+import rich.repr
+
+from .apartment import ComApartment, dispatch, getActiveObject, withEvents
+from .callbacks import dispatchCallback
+from .capl import CAPL
+from .common import RefBool, waitEventFinished
+from .comproperty import ComObject, ComProperty
+from .configuration import Configuration, PLPath
+from .measurement import Measurement
+from .ui import UI
+from .version import Version
+
+LOG = logging.getLogger("VectorCOM")
+
+
+@rich.repr.auto
+class Canoe(ComObject):
+    class _Events:
+        OnOpenCbk: ClassVar[Callable[[str], None]] = lambda fullname: LOG.debug(
+            "Opened CANoe configuration file: '%s'", fullname
+        )
+        OnQuitCbk: ClassVar[Callable[..., None]] = lambda: LOG.debug(
+            "Quitting CANoe ..."
+        )
+        OnOpenFinished: RefBool
+        OnQuitFinished: RefBool
+
+        def __init__(self):
+            self.OnOpenFinished = RefBool(True)
+            self.OnQuitFinished = RefBool(True)
+
+        def OnOpen(self, fullname: str):
+            self.OnOpenFinished.true
+            dispatchCallback(type(self).OnOpenCbk, fullname)
+
+        def OnQuit(self):
+            self.OnQuitFinished.true
+            dispatchCallback(type(self).OnQuitCbk)
+
+    __slots__ = ("apartment", "events", "_capl")
+
+    apartment: Optional[ComApartment]
+    events: _Events
+    _capl: Optional[CAPL]
+
+    @property
+    def Bus(self) -> NotImplementedType:
+        return NotImplemented
+
+    @property
+    def CAPL(self) -> CAPL:
+        # One instance per application: registered functions and the
+        # measurement hooks that resolve them must outlive the property access.
+        if self._capl is None:
+            self._capl = CAPL(self._com.CAPL, self.Measurement)
+        return self._capl
+
+    ChannelMappingName = ComProperty[str](writable=True)
+    Configuration = ComProperty(Configuration)
+
+    @property
+    def Environment(self) -> NotImplementedType:
+        return NotImplemented
+
+    FullName = ComProperty[str]()
+    Measurement = ComProperty(Measurement)
+    Name = ComProperty[str]()
+
+    @property
+    def Networks(self) -> NotImplementedType:
+        return NotImplemented
+
+    Path = ComProperty(PLPath)
+
+    @property
+    def Performance(self) -> NotImplementedType:
+        return NotImplemented
+
+    @property
+    def Simulation(self) -> NotImplementedType:
+        return NotImplemented
+
+    @property
+    def System(self) -> NotImplementedType:
+        return NotImplemented
+
+    UI = ComProperty(UI)
+    Visible = ComProperty[bool](writable=True)
+    Version = ComProperty(Version)
+
+    def Open(
+        self,
+        path: PLPath,
+        autoSave: Optional[bool] = None,
+        promptUser: Optional[bool] = None,
+        timeout: float = 0,
+    ) -> None:
+        self.events.OnOpenFinished.false
+        if autoSave and promptUser:
+            self._com.Open(path, autoSave, promptUser)
+        elif autoSave:
+            self._com.Open(path, autoSave)
+        else:
+            self._com.Open(path)
+        waitEventFinished(self.events.OnOpenFinished, timeout)
+
+    def Quit(self) -> None:
+        self.events.OnQuitFinished.false
+        self._com.Quit()
+        waitEventFinished(self.events.OnQuitFinished)
+
+    @property
+    def OnOpen(self) -> Callable[[str], None]:
+        return self._Events.OnOpenCbk
+
+    @OnOpen.setter
+    def OnOpen(self, callback: Callable[[str], None]) -> None:
+        self._Events.OnOpenCbk = callback
+
+    @property
+    def OnQuit(self) -> Callable[[], None]:
+        return self._Events.OnQuitCbk
+
+    @OnQuit.setter
+    def OnQuit(self, callback: Callable[[], None]) -> None:
+        self._Events.OnQuitCbk = callback
+
+    def __init__(
+        self,
+        apartment: Optional[ComApartment] = None,
+        newInstance: bool = False,
+        attach: bool = False,
+    ) -> None:
+        self.apartment = apartment
+        self._capl = None
+        if attach:
+            super().__init__(getActiveObject("CANoe.Application", apartment))
+        else:
+            super().__init__(dispatch("CANoe.Application", apartment, newInstance))
+        self.events = cast(Canoe._Events, withEvents(self._com, self._Events))
+
+    def __rich_repr__(self):
+        yield "Bus", self.Bus
+        yield "CAPL", self.CAPL
+        yield "ChannelMappingName", self.ChannelMappingName
+        yield self.Configuration
+        yield "Environment", self.Environment
+        yield "FullName", self.FullName
+        yield self.Measurement
+        yield "Name", self.Name
+        yield "Networks", self.Networks
+        yield "Path", self.Path
+        yield "Performance", self.Performance
+        yield "Simulation", self.Simulation
+        yield "System", self.System
+        yield "UI", self.UI
+        yield "Visible", self.Visible
+        yield self.Version
@@ -0,0 +1,120 @@
+import logging
+import threading
+from time import perf_counter
+from typing import Any, Iterable, Sequence
+
+import rich.repr
+from win32com.client import CDispatch
+
+from .apartment import ComProxy
+from .common import LatencyStats
+from .comproperty import ComObject, ComProperty
+from .measurement import Measurement
+
+LOG = logging.getLogger("VectorCOM")
+
+
+@rich.repr.auto
+class CAPLFunction(ComObject):
+    __slots__ = ("name", "stats")
+
+    ParameterCount = ComProperty[int](cache=True)
+    ParameterTypes = ComProperty(tuple, cache=True)
+
+    def Call(self, *args: Any) -> Any:
+        start = perf_counter()
+        try:
+            return self._com.Call(*args)
+        finally:
+            self.stats.record(perf_counter() - start)
+
+    def __init__(self, function: CDispatch, name: str, stats: LatencyStats) -> None:
+        super().__init__(function)
+        self.name = name
+        self.stats = stats
+
+    def __call__(self, *args: Any) -> Any:
+        return self.Call(*args)
+
+    def __rich_repr__(self):
+        yield "name", self.name
+        yield "ParameterCount", self.ParameterCount
+        yield "ParameterTypes", self.ParameterTypes
+        yield "stats", self.stats
+
+
+@rich.repr.auto
+class CAPL(ComObject):
+    __slots__ = ("measurement", "stats", "_names", "_functions", "_lock")
+
+    measurement: Measurement
+    stats: dict[str, LatencyStats]
+    _names: dict[str, None]
+    _functions: dict[str, CAPLFunction]
+    _lock: threading.Lock
+
+    def GetFunction(self, name: str) -> CAPLFunction:
+        function = self._com.GetFunction(name)
+        return CAPLFunction(function, name, self.stats.setdefault(name, LatencyStats()))
+
+    def register(self, *names: str) -> None:
+        with self._lock:
+            self._names.update(dict.fromkeys(names))
+
+    def function(self, name: str) -> CAPLFunction:
+        try:
+            return self._functions[name]
+        except KeyError:
+            if name not in self._names:
+                raise KeyError(
+                    f"CAPL function '{name}' is not registered, call register() "
+                    "before the measurement starts"
+                ) from None
+            raise RuntimeError(
+                f"CAPL function '{name}' is not resolved, the measurement is not "
+                "initialized"
+            ) from None
+
+    def call(self, name: str, *args: Any) -> Any:
+        return self.function(name).Call(*args)
+
+    def callMany(self, calls: Iterable[tuple[str, Sequence[Any]]]) -> list[Any]:
+        jobs = [(self.function(name), tuple(args)) for name, args in calls]
+
+        def run() -> list[Any]:
+            return [function.Call(*args) for function, args in jobs]
+
+        # Through an apartment the whole batch is a single round trip.
+        if isinstance(self._com, ComProxy):
+            return self._com.apartment.call(run)
+        return run()
+
+    def _resolve(self) -> None:
+        with self._lock:
+            names = list(self._names)
+        functions = {}
+        for name in names:
+            try:
+                functions[name] = self.GetFunction(name)
+            except Exception:
+                LOG.exception("Could not resolve CAPL function '%s'", name)
+        self._functions = functions
+        LOG.debug("Resolved %d CAPL functions", len(functions))
+
+    def _invalidate(self) -> None:
+        self._functions = {}
+
+    def __init__(self, capl: CDispatch, measurement: Measurement) -> None:
+        super().__init__(capl)
+        self.measurement = measurement
+        self.stats = {}
+        self._names = {}
+        self._functions = {}
+        self._lock = threading.Lock()
+        measurement.events.OnInitHooks.append(self._resolve)
+        measurement.events.OnExitHooks.append(self._invalidate)
+
+    def __rich_repr__(self):
+        yield "registered", list(self._names)
+        yield "resolved", list(self._functions)
+        yield "stats", self.stats
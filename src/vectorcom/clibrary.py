@@ -0,0 +1,50 @@
+from pathlib import Path as PLPath
+
+import rich.repr
+from win32com.client import CDispatch
+
+from .comproperty import ComObject, ComProperty
+
+
+@rich.repr.auto
+class CLibrary(ComObject):
+    __slots__ = ()
+
+    FullName = ComProperty[str]()
+    Name = ComProperty[str]()
+    Path = ComProperty(PLPath)
+
+    def __init__(self, clibrary: CDispatch) -> None:
+        super().__init__(clibrary)
+
+    def __rich_repr__(self):
+        yield "FullName", self.FullName
+        yield "Name", self.Name
+        yield "Path", self.Path
+
+
+@rich.repr.auto
+class CLibraries(ComObject):
+    __slots__ = ()
+
+    Count = ComProperty[int]()
+
+    def Item(self, index: int) -> CLibrary:
+        return CLibrary(self._com.Item(index))
+
+    def Add(self, fullName: str) -> None:
+        self._com.Add(fullName)
+
+    def Remove(self, index: int) -> None:
+        self._com.Remove(index)
+
+    def __init__(self, clibraries: CDispatch) -> None:
+        super().__init__(clibraries)
+
+    def __iter__(self):
+        for i in range(1, self.Count + 1):
+            yield self.Item(i)
+
+    def __rich_repr__(self):
+        yield "Count", self.Count
+        yield list(self)
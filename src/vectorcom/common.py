@@ -1,7 +1,11 @@
 from enum import IntEnum
 from time import sleep, time
+from typing import Callable, Optional, Sequence
 
-import pythoncom
+try:
+    import pythoncom
+except ImportError:  # pywin32 only exists on Windows; remote clients wait without it
+    pythoncom = None
 
 
 class RefBool:
@@ -20,6 +24,30 @@ class RefBool:
         return self._value
 
 
+class LatencyStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyStats(count={self.count}, mean={self.mean:.6f}, "
+            f"min={self.min if self.count else 0.0:.6f}, max={self.max:.6f})"
+        )
+
+
 class Verdict(IntEnum):
     VerdictNotAvailable = 0
     VerdictPassed = 1
@@ -48,11 +76,42 @@ class StopReason(IntEnum):
     StopReasonVerdictImpact = 3
 
 
-def waitEventFinished(event: RefBool, timeout: float = 0, waitstep: float = 0.1):
+def waitEventFinished(
+    event: RefBool,
+    timeout: float = 0,
+    waitstep: float = 0.1,
+    onWait: Optional[Callable[[], None]] = None,
+):
+    waitAllFinished([event], timeout, waitstep, onWait)
+
+
+def waitAllFinished(
+    events: Sequence[RefBool],
+    timeout: float = 0,
+    waitstep: float = 0.1,
+    onWait: Optional[Callable[[], None]] = None,
+) -> None:
     start_time = time()
     while (timeout == 0) or (time() - start_time < timeout):
-        pythoncom.PumpWaitingMessages()
-        if event:
+        if pythoncom is not None:
+            pythoncom.PumpWaitingMessages()
+        if all(events):
             return
+        if onWait is not None:
+            onWait()
+        sleep(waitstep)
+    raise TimeoutError("Events did not finish in time")
+
+
+def waitAnyFinished(
+    events: Sequence[RefBool], timeout: float = 0, waitstep: float = 0.1
+) -> int:
+    start_time = time()
+    while (timeout == 0) or (time() - start_time < timeout):
+        if pythoncom is not None:
+            pythoncom.PumpWaitingMessages()
+        for index, event in enumerate(events):
+            if event:
+                return index
         sleep(waitstep)
-    raise TimeoutError("Event did not finish in time")
+    raise TimeoutError("No event finished in time")
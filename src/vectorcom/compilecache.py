@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path as PLPath
+from time import perf_counter
+from typing import Any, Iterable, Optional, Union
+
+from .configuration import Configuration
+
+LOG = logging.getLogger("VectorCOM")
+
+CHUNK_SIZE = 1 << 20
+
+CAPL_SUFFIXES = (".can", ".cin")
+
+_INCLUDE = re.compile(rb'#include\s+"([^"]+)"')
+
+
+def _hashFile(path: PLPath) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def caplIncludes(sources: list[PLPath]) -> list[PLPath]:
+    seen: dict[PLPath, None] = {}
+    stack = list(sources)
+    while stack:
+        source = stack.pop().resolve()
+        if source in seen:
+            continue
+        seen[source] = None
+        try:
+            data = source.read_bytes()
+        except OSError:
+            continue
+        for match in _INCLUDE.finditer(data):
+            stack.append(source.parent / match.group(1).decode("latin-1"))
+    return list(seen)
+
+
+class CompileCache:
+    def __init__(
+        self,
+        path: Optional[Union[str, PLPath]] = None,
+        extraSources: Iterable[Union[str, PLPath]] = (),
+        workers: int = 8,
+        sourcesComplete: bool = False,
+    ) -> None:
+        self.path = None if path is None else PLPath(path)
+        self.extraSources = [PLPath(source) for source in extraSources]
+        self.sourcesComplete = sourcesComplete
+        self.workers = workers
+        self.hits = 0
+        self.misses = 0
+        self.unverified = 0
+        self.timeSaved = 0.0
+        self._state: dict[str, Any] = {}
+
+    def _cacheFile(self, configuration: Configuration) -> PLPath:
+        if self.path is not None:
+            return self.path
+        return PLPath(configuration.FullName).with_suffix(".compilecache.json")
+
+    def _load(self, cache_file: PLPath) -> dict[str, Any]:
+        try:
+            with open(cache_file, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def sources(self, configuration: Configuration) -> list[PLPath]:
+        base = configuration.Path
+        files = [PLPath(configuration.FullName)]
+        files.extend(base / name for name in configuration.UserFiles)
+        files.extend(base / clib.FullName for clib in configuration.CLibraries)
+        for source in self.extraSources:
+            source = base / source
+            if source.is_dir():
+                files.extend(p for p in sorted(source.rglob("*")) if p.is_file())
+            else:
+                files.append(source)
+        capl = [path for path in files if path.suffix.lower() in CAPL_SUFFIXES]
+        files.extend(caplIncludes(capl))
+        return list(dict.fromkeys(path.resolve() for path in files))
+
+    def fingerprint(self, configuration: Configuration) -> dict[str, list[Any]]:
+        previous = self._state.get("files", {})
+
+        def entry(path: PLPath) -> tuple[str, list[Any]]:
+            key = str(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return key, [None, None, None]
+            # Unchanged size and mtime: trust the stored hash, skip reading.
+            old = previous.get(key)
+            if old is not None and old[:2] == [stat.st_size, stat.st_mtime_ns]:
+                return key, old
+            return key, [stat.st_size, stat.st_mtime_ns, _hashFile(path)]
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            return dict(pool.map(entry, self.sources(configuration)))
+
+    def compileAndVerify(
+        self, configuration: Configuration, force: bool = False
+    ) -> bool:
+        cache_file = self._cacheFile(configuration)
+        self._state = self._load(cache_file)
+        start = perf_counter()
+        files = self.fingerprint(configuration)
+        hashes = {key: value[2] for key, value in files.items()}
+        stored = {key: value[2] for key, value in self._state.get("files", {}).items()}
+        # Node and test module sources cannot be listed from the configuration
+        # (SimulationSetup and TestSetup are not wrapped), so any missing from
+        # extraSources would hide an edit. Only the caller can vouch for them.
+        if not self.sourcesComplete:
+            self.unverified += 1
+            if self.unverified == 1:
+                LOG.warning(
+                    "extraSources not declared complete, pass sourcesComplete=True "
+                    "once they list every node and test module; compiling "
+                    "unconditionally"
+                )
+        if (
+            not force
+            and self.sourcesComplete
+            and self._state.get("ok")
+            and hashes == stored
+        ):
+            self.hits += 1
+            saved = self._state.get("duration", 0.0) - (perf_counter() - start)
+            self.timeSaved += max(saved, 0.0)
+            LOG.info(
+                "CompileAndVerify skipped, %d sources unchanged (~%.1fs saved, "
+                "%d hits / %d misses)",
+                len(files),
+                saved,
+                self.hits,
+                self.misses,
+            )
+            return False
+        self.misses += 1
+        self._state = {"files": files, "ok": False}
+        compile_start = perf_counter()
+        configuration.CompileAndVerify()
+        self._state["duration"] = perf_counter() - compile_start
+        self._state["ok"] = True
+        tmp = cache_file.with_suffix(cache_file.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(self._state, file)
+        tmp.replace(cache_file)
+        LOG.info(
+            "CompileAndVerify ran in %.1fs (%d hits / %d misses)",
+            self._state["duration"],
+            self.hits,
+            self.misses,
+        )
+        return True
@@ -0,0 +1,184 @@
+from enum import Enum
+from time import perf_counter
+from typing import Any, Callable, Generic, Iterable, Optional, TypeVar, overload
+
+T = TypeVar("T")
+
+Tracer = Callable[[type, str, float], None]
+
+_tracer: Optional[Tracer] = None
+
+
+def setPropertyTracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+class ComObject:
+    __slots__ = ("_com", "_cache")
+
+    def __init__(self, com: Any) -> None:
+        self._com = com
+        self._cache: Optional[dict[str, Any]] = None
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._cache = None
+        elif self._cache is not None:
+            self._cache.pop(name, None)
+
+
+class ComProperty(Generic[T]):
+    __slots__ = ("name", "comName", "convert", "optional", "writable", "cache")
+
+    def __init__(
+        self,
+        convert: Optional[Callable[[Any], T]] = None,
+        *,
+        comName: Optional[str] = None,
+        optional: bool = False,
+        writable: bool = False,
+        cache: bool = False,
+    ) -> None:
+        self.name = comName or ""
+        self.comName = comName or ""
+        self.convert = convert
+        self.optional = optional
+        self.writable = writable
+        self.cache = cache
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        if not self.comName:
+            self.comName = name
+
+    def _convert(self, value: Any) -> Any:
+        if value is None or self.convert is None:
+            return value
+        return self.convert(value)
+
+    def _read(self, com: Any) -> Any:
+        try:
+            return self._convert(getattr(com, self.comName))
+        except AttributeError as attr_e:
+            if self.optional and attr_e.name == self.comName:
+                return None
+            raise
+
+    @overload
+    def __get__(self, obj: None, owner: Optional[type] = None) -> "ComProperty[T]": ...
+
+    @overload
+    def __get__(self, obj: ComObject, owner: Optional[type] = None) -> T: ...
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        if self.cache and obj._cache is not None and self.name in obj._cache:
+            return obj._cache[self.name]
+        if _tracer is None:
+            value = self._read(obj._com)
+        else:
+            start = perf_counter()
+            value = self._read(obj._com)
+            _tracer(type(obj), self.name, perf_counter() - start)
+        if self.cache:
+            if obj._cache is None:
+                obj._cache = {}
+            obj._cache[self.name] = value
+        return value
+
+    def __set__(self, obj: ComObject, value: T) -> None:
+        if not self.writable:
+            raise AttributeError(
+                f"property '{self.name}' of '{type(obj).__name__}' object has no setter"
+            )
+        raw = value.value if isinstance(value, Enum) else value
+        setattr(obj._com, self.comName, raw)
+        if self.cache:
+            obj.invalidate(self.name)
+
+    def __repr__(self) -> str:
+        return f"ComProperty({self.name!r})"
+
+
+def comProperties(cls: type) -> dict[str, ComProperty]:
+    props: dict[str, ComProperty] = {}
+    for klass in reversed(cls.__mro__):
+        for name, attr in vars(klass).items():
+            if isinstance(attr, ComProperty):
+                props[name] = attr
+    return props
+
+
+def readProperties(
+    obj: ComObject, names: Iterable[str], errors: bool = False
+) -> dict[str, Any]:
+    # Imported here so the descriptors import without pywin32; reading through
+    # an apartment does need it, .apartment imports pythoncom.
+    from .apartment import ComProxy, _wrap
+
+    names = list(names)
+    props = [getattr(type(obj), name) for name in names]
+    call = _guarded if errors else _call
+    com = obj._com
+    if not isinstance(com, ComProxy) or not all(
+        isinstance(prop, ComProperty) for prop in props
+    ):
+        return {name: call(getattr, obj, name) for name in names}
+    # Same semantics as ComProperty.__get__: cached values are not read again
+    # and the tracer sees every property that is.
+    cache = obj._cache or {}
+    values = {
+        prop.name: cache[prop.name]
+        for prop in props
+        if prop.cache and prop.name in cache
+    }
+    props = [prop for prop in props if prop.name not in values]
+    if not props:
+        return {name: values[name] for name in names}
+    # One apartment round trip for all reads instead of one per property.
+    apartment, target = com.apartment, com._target
+
+    def read(prop: ComProperty) -> tuple[Any, float]:
+        start = perf_counter()
+        try:
+            value = _wrap(apartment, getattr(target, prop.comName))
+        except AttributeError as attr_e:
+            if not (prop.optional and attr_e.name == prop.comName):
+                raise
+            value = None
+        return value, perf_counter() - start
+
+    raw = apartment.call(lambda: [call(read, prop) for prop in props])
+    tracer = _tracer
+    for prop, result in zip(props, raw):
+        if isinstance(result, Exception):
+            values[prop.name] = result
+            continue
+        value, elapsed = result
+        start = perf_counter()
+        value = values[prop.name] = call(prop._convert, value)
+        if isinstance(value, Exception):
+            continue
+        if tracer is not None:
+            tracer(type(obj), prop.name, elapsed + perf_counter() - start)
+        if prop.cache:
+            if obj._cache is None:
+                obj._cache = {}
+            obj._cache[prop.name] = value
+    return {name: values[name] for name in names}
+
+
+def _call(fn: Callable[..., Any], *args: Any) -> Any:
+    return fn(*args)
+
+
+def _guarded(fn: Callable[..., Any], *args: Any) -> Any:
+    # Failures are returned in place of the value, so one bad property does
+    # not cost the others.
+    try:
+        return fn(*args)
+    except Exception as exc:
+        return exc
@@ -0,0 +1,126 @@
+import json
+import logging
+import tomllib
+from enum import IntEnum
+from pathlib import Path as PLPath
+from time import perf_counter
+from typing import Any, Mapping, Union
+
+from .comproperty import ComProperty, comProperties, readProperties
+from .configuration import Configuration
+
+LOG = logging.getLogger("VectorCOM")
+
+# Switching these reconfigures CANoe and can reset other settings, so they are
+# written first and the remaining properties are compared again afterwards.
+LEADING = ("Mode", "ExecutionEnvironment")
+
+WRITE_ORDER = (
+    *LEADING,
+    "HwConfigurationSelection",
+    "FDXTransportLayer",
+    "FDXPort",
+    "FDXEnabled",
+    "XILAPIPort",
+)
+
+
+def _coerce(prop: ComProperty, value: Any) -> Any:
+    convert = prop.convert
+    if isinstance(convert, type) and issubclass(convert, IntEnum):
+        return convert[value] if isinstance(value, str) else convert(value)
+    return value
+
+
+class ProfileResult:
+    def __init__(self) -> None:
+        self.changes: dict[str, tuple[Any, Any]] = {}
+        self.writeTimes: dict[str, float] = {}
+        self.readTime = 0.0
+        self.total = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changes)
+
+    def __repr__(self) -> str:
+        changes = ", ".join(
+            f"{name}: {old!r} -> {new!r}" for name, (old, new) in self.changes.items()
+        )
+        return (
+            f"ProfileResult({{{changes}}}, readTime={self.readTime:.3f}, "
+            f"writeTime={sum(self.writeTimes.values()):.3f}, total={self.total:.3f})"
+        )
+
+
+class ConfigurationProfile:
+    def __init__(self, values: Mapping[str, Any]) -> None:
+        props = comProperties(Configuration)
+        self.values: dict[str, Any] = {}
+        for name, value in values.items():
+            prop = props.get(name)
+            if prop is None or not prop.writable:
+                raise ValueError(f"'{name}' is not a writable Configuration property")
+            self.values[name] = _coerce(prop, value)
+        rank = {name: index for index, name in enumerate(WRITE_ORDER)}
+        self.order = sorted(
+            self.values, key=lambda name: rank.get(name, len(WRITE_ORDER))
+        )
+
+    @classmethod
+    def fromFile(cls, path: Union[str, PLPath]) -> "ConfigurationProfile":
+        path = PLPath(path)
+        if path.suffix.lower() == ".toml":
+            with open(path, "rb") as file:
+                return cls(tomllib.load(file))
+        if path.suffix.lower() == ".json":
+            with open(path, encoding="utf-8") as file:
+                return cls(json.load(file))
+        raise ValueError(f"Unknown profile format '{path.suffix}'")
+
+    def diff(self, configuration: Configuration) -> dict[str, tuple[Any, Any]]:
+        return self._diff(configuration, self.order)
+
+    def _diff(
+        self, configuration: Configuration, names: list[str]
+    ) -> dict[str, tuple[Any, Any]]:
+        current = readProperties(configuration, names)
+        return {
+            name: (current[name], self.values[name])
+            for name in names
+            if current[name] != self.values[name]
+        }
+
+    def apply(self, configuration: Configuration) -> ProfileResult:
+        result = ProfileResult()
+        start = perf_counter()
+        pending = self.diff(configuration)
+        result.readTime = perf_counter() - start
+        leading = [name for name in LEADING if name in pending]
+        for name in leading:
+            self._write(configuration, name, pending.pop(name), result)
+        if leading:
+            # A leading write can also change properties that already matched,
+            # so every remaining name is compared again, not just the pending.
+            read_start = perf_counter()
+            pending = self._diff(
+                configuration, [name for name in self.order if name not in LEADING]
+            )
+            result.readTime += perf_counter() - read_start
+        for name, change in pending.items():
+            self._write(configuration, name, change, result)
+        result.total = perf_counter() - start
+        LOG.info("Applied configuration profile: %r", result)
+        return result
+
+    def _write(
+        self,
+        configuration: Configuration,
+        name: str,
+        change: tuple[Any, Any],
+        result: ProfileResult,
+    ) -> None:
+        start = perf_counter()
+        setattr(configuration, name, change[1])
+        result.writeTimes[name] = perf_counter() - start
+        result.changes[name] = change
@@ -5,11 +5,16 @@ from types import NotImplementedType
 from typing import Callable, ClassVar
 
 import rich.repr
-from win32com.client import WithEvents
 from win32com.client.dynamic import CDispatch
 
+from .apartment import withEvents
+from .callbacks import dispatchCallback
+from .clibrary import CLibraries
 from .common import RefBool
+from .comproperty import ComObject, ComProperty
+from .onlinesetup import OnlineSetup
 from .testconfiguration import TestConfigurations
+from .userfiles import UserFiles
 
 LOG = logging.getLogger("VectorCOM")
 
@@ -32,7 +37,7 @@ class CfgFDXTL(IntEnum):
 
 
 @rich.repr.auto
-class Configuration:
+class Configuration(ComObject):
     class _Events:
         OnCloseCbk: ClassVar[Callable[..., None]] = lambda: LOG.debug(
             "Closed CANoe configuration"
@@ -40,44 +45,31 @@ class Configuration:
         OnSysVarDefChangedCbk: ClassVar[Callable[..., None]] = lambda: LOG.debug(
             "System variable definition changed"
         )
-        OnCloseFinished: ClassVar[RefBool] = RefBool(True)
-        OnSysVarDefChangedFinished: ClassVar[RefBool] = RefBool(True)
+        OnCloseFinished: RefBool
+        OnSysVarDefChangedFinished: RefBool
 
-        @classmethod
-        def OnClose(cls):
-            cls.OnCloseCbk()
-            cls.OnCloseFinished.true
+        def __init__(self):
+            self.OnCloseFinished = RefBool(True)
+            self.OnSysVarDefChangedFinished = RefBool(True)
 
-        @classmethod
-        def OnSystemVariablesDefinitionChanged(cls):
-            cls.OnSysVarDefChangedCbk()
-            cls.OnSysVarDefChangedFinished.true
+        def OnClose(self):
+            self.OnCloseFinished.true
+            dispatchCallback(type(self).OnCloseCbk)
 
-    _com: ClassVar[CDispatch]
+        def OnSystemVariablesDefinitionChanged(self):
+            self.OnSysVarDefChangedFinished.true
+            dispatchCallback(type(self).OnSysVarDefChangedCbk)
 
-    @property
-    def AsynchronousCheckEvaluationEnabled(self) -> bool:
-        return self._com.AsynchronousCheckEvaluationEnabled
+    __slots__ = ("_events",)
 
-    @AsynchronousCheckEvaluationEnabled.setter
-    def AsynchronousCheckEvaluationEnabled(self, value: bool) -> None:
-        self._com.AsynchronousCheckEvaluationEnabled = value
+    AsynchronousCheckEvaluationEnabled = ComProperty[bool](writable=True)
 
     @property
     def CANoe4Server(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def CLibraries(self) -> NotImplementedType:
-        return NotImplemented
-
-    @property
-    def Comment(self) -> str:
-        return self._com.Comment
-
-    @Comment.setter
-    def Comment(self, value: str) -> None:
-        self._com.Comment = value
+    CLibraries = ComProperty(CLibraries)
+    Comment = ComProperty[str](writable=True)
 
     @property
     def CommunicationSetup(self) -> NotImplementedType:
@@ -91,45 +83,16 @@ class Configuration:
     def EthernetBusSystem(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def ExecutionEnvironment(self) -> CfgExeVariant:
-        return CfgExeVariant(self._com.ExecutionEnvironment)
-
-    @ExecutionEnvironment.setter
-    def ExecutionEnvironment(self, new_env: CfgExeVariant) -> None:
-        self._com.ExecutionEnvironment = new_env.value
-
-    @property
-    def FDXEnabled(self) -> bool:
-        return self._com.FDXEnabled
-
-    @FDXEnabled.setter
-    def FDXEnabled(self, value: bool) -> None:
-        self._com.FDXEnabled = value
+    ExecutionEnvironment = ComProperty(CfgExeVariant, writable=True)
+    FDXEnabled = ComProperty[bool](writable=True)
 
     @property
     def FDXFiles(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def FDXPort(self) -> int:
-        return self._com.FDXPort
-
-    @FDXPort.setter
-    def FDXPort(self, value: int) -> None:
-        self._com.FDXPort = value
-
-    @property
-    def FDXTransportLayer(self) -> CfgFDXTL:
-        return CfgFDXTL(self._com.FDXTransportLayer)
-
-    @FDXTransportLayer.setter
-    def FDXTransportLayer(self, new_value: CfgFDXTL) -> None:
-        self._com.FDXTransportLayer = new_value.value
-
-    @property
-    def FullName(self) -> str:
-        return self._com.FullName
+    FDXPort = ComProperty[int](writable=True)
+    FDXTransportLayer = ComProperty(CfgFDXTL, writable=True)
+    FullName = ComProperty[str]()
 
     @property
     def GeneralSetup(self) -> NotImplementedType:
@@ -143,89 +106,47 @@ class Configuration:
     def HardwareConfigurations(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def HwConfigurationSelection(self) -> int:
-        return self._com.HwConfigurationSelection
-
-    @HwConfigurationSelection.setter
-    def HwConfigurationSelection(self, value: int) -> None:
-        self._com.HwConfigurationSelection = value
+    HwConfigurationSelection = ComProperty[int](writable=True)
 
     @property
     def IOHardware(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def Mode(self) -> CfgMode:
-        return CfgMode(self._com.mode)
-
-    @Mode.setter
-    def Mode(self, new_mode: CfgMode) -> None:
-        self._com.Mode = new_mode.value
-
-    @property
-    def Modified(self) -> bool:
-        return self._com.Modified
+    Mode = ComProperty(CfgMode, writable=True)
+    Modified = ComProperty[bool]()
 
     @property
     def MultiCANoe(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def Name(self) -> str:
-        return self._com.Name
-
-    @property
-    def NETTargetFramework(self) -> int:
-        return self._com.NETTargetFramework
+    Name = ComProperty[str]()
+    NETTargetFramework = ComProperty[int]()
 
     @property
     def OfflineSetup(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def OnlineSetup(self) -> NotImplementedType:
-        return NotImplemented
+    OnlineSetup = ComProperty(OnlineSetup)
 
     @property
     def OpenConfigurationResult(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def Path(self) -> PLPath:
-        return PLPath(self._com.Path)
-
-    @property
-    def ReadOnly(self) -> bool:
-        return self._com.ReadOnly
-
-    @property
-    def Saved(self) -> bool:
-        return self._com.Saved
+    Path = ComProperty(PLPath)
+    ReadOnly = ComProperty[bool]()
+    Saved = ComProperty[bool]()
 
     @property
     def Sensor(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def ServiceGeneratorActive(self) -> bool:
-        return self._com.ServiceGeneratorActive
-
-    @ServiceGeneratorActive.setter
-    def ServiceGeneratorActive(self, value: bool) -> None:
-        self._com.ServiceGeneratorActive = value
+    ServiceGeneratorActive = ComProperty[bool](writable=True)
 
     @property
     def SimulationSetup(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def SplitOverlappingFlexRayNMFrames(self) -> bool:
-        return self._com.SplitOverlappingFlexRayNMFrames
-
-    @SplitOverlappingFlexRayNMFrames.setter
-    def SplitOverlappingFlexRayNMFrames(self, value: bool) -> None:
-        self._com.SplitOverlappingFlexRayNMFrames = value
+    SplitOverlappingFlexRayNMFrames = ComProperty[bool](writable=True)
 
     @property
     def StandaloneMode(self) -> NotImplementedType:
@@ -239,45 +160,24 @@ class Configuration:
     def SymbolMappings(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def TestConfigurations(self) -> TestConfigurations:
-        return TestConfigurations(self._com.TestConfigurations)
+    TestConfigurations = ComProperty(TestConfigurations)
 
     @property
     def TestSetup(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def UserFiles(self) -> NotImplementedType:
-        return NotImplemented
-
-    @property
-    def UseShortLabel(self) -> bool:
-        return self._com.UseShortLabel
-
-    @UseShortLabel.setter
-    def UseShortLabel(self, value: bool) -> None:
-        self._com.UseShortLabel = value
+    UserFiles = ComProperty(UserFiles)
+    UseShortLabel = ComProperty[bool](writable=True)
 
     @property
     def VTSystem(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def XILAPIEnabled(self) -> bool:
-        return self._com.XILAPIEnabled
-
-    @property
-    def XILAPIPort(self) -> int:
-        return self._com.XILAPIPort
-
-    @XILAPIPort.setter
-    def XILAPIPort(self, value: int) -> None:
-        self._com.XILAPIPort = value
+    XILAPIEnabled = ComProperty[bool]()
+    XILAPIPort = ComProperty[int](writable=True)
 
-    @classmethod
-    def CompileAndVerify(cls):
-        cls._com.CompileAndVerify()
+    def CompileAndVerify(self):
+        self._com.CompileAndVerify()
 
     @property
     def OnClose(self) -> Callable[[], None]:
@@ -296,8 +196,8 @@ class Configuration:
         self._Events.OnSysVarDefChangedCbk = callback
 
     def __init__(self, configuration: CDispatch) -> None:
-        self.__class__._com = configuration
-        self._events = WithEvents(configuration, self._Events)
+        super().__init__(configuration)
+        self._events = withEvents(configuration, self._Events)
 
     def __rich_repr__(self):
         yield (
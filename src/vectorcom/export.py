@@ -0,0 +1,168 @@
+import json
+from enum import IntEnum
+from pathlib import Path as PLPath
+from pathlib import PurePath
+from typing import IO, Any, Collection, Iterator, Mapping, Optional, Union
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, JSON Lines works without it
+    msgpack = None
+
+from .comproperty import ComObject, comProperties, readProperties
+
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".msgpack": "msgpack"}
+
+_PROPERTIES: dict[type, tuple[str, ...]] = {}
+
+
+def _properties(cls: type) -> tuple[str, ...]:
+    # Only COM-backed properties: plain Python properties (Canoe.CAPL, ...) are
+    # helpers with side effects and would also break the batched read.
+    if cls not in _PROPERTIES:
+        _PROPERTIES[cls] = tuple(comProperties(cls))
+    return _PROPERTIES[cls]
+
+
+def _isCollection(obj: Any) -> bool:
+    return hasattr(obj, "Item") and hasattr(obj, "Count") and hasattr(obj, "__iter__")
+
+
+def _scalar(value: Any) -> tuple[bool, Any]:
+    if value is None or isinstance(value, (bool, str, float)):
+        return True, value
+    if isinstance(value, IntEnum):
+        return True, value.name
+    if isinstance(value, int):
+        return True, value
+    if isinstance(value, PurePath):
+        return True, str(value)
+    return False, value
+
+
+def _format(path: Union[str, PLPath], format: Optional[str]) -> str:
+    if format is None:
+        format = FORMATS.get(PLPath(path).suffix.lower(), "jsonl")
+    if format not in ("jsonl", "msgpack"):
+        raise ValueError(f"Unknown export format '{format}'")
+    if format == "msgpack" and msgpack is None:
+        raise ImportError("msgpack export requires the 'msgpack' package")
+    return format
+
+
+class StreamExporter:
+    def __init__(
+        self,
+        sink: IO,
+        format: str = "jsonl",
+        maxDepth: Optional[int] = None,
+        fields: Optional[Mapping[str, Collection[str]]] = None,
+    ) -> None:
+        self.sink = sink
+        self.format = format
+        self.maxDepth = maxDepth
+        self.fields = fields or {}
+        self.count = 0
+        if format == "msgpack":
+            if msgpack is None:
+                raise ImportError("msgpack export requires the 'msgpack' package")
+            self._packer = msgpack.Packer()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self.format == "msgpack":
+            self.sink.write(self._packer.pack(record))
+        else:
+            self.sink.write(json.dumps(record) + "\n")
+        self.count += 1
+
+    def _selected(self, cls: type) -> tuple[str, ...]:
+        names = _properties(cls)
+        wanted = self.fields.get(cls.__name__, self.fields.get("*"))
+        if wanted is None:
+            return names
+        return tuple(name for name in names if name in wanted)
+
+    def export(self, obj: Any, name: str = "root") -> int:
+        start = self.count
+        self._export(obj, name, None, 0)
+        return self.count - start
+
+    def _export(self, obj: Any, name: str, parent: Optional[int], depth: int) -> None:
+        record_id = self.count
+        fields: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        children: list[tuple[str, Any]] = []
+        values: dict[str, Any] = {}
+        if isinstance(obj, ComObject):
+            values = readProperties(obj, self._selected(type(obj)), errors=True)
+        for prop, value in values.items():
+            if isinstance(value, Exception):
+                errors[prop] = f"{type(value).__name__}: {value}"
+                continue
+            is_scalar, value = _scalar(value)
+            if is_scalar:
+                fields[prop] = value
+            else:
+                children.append((prop, value))
+        record = {
+            "id": record_id,
+            "parent": parent,
+            "depth": depth,
+            "name": name,
+            "type": type(obj).__name__,
+            "fields": fields,
+        }
+        if errors:
+            record["errors"] = errors
+        self._write(record)
+        if self.maxDepth is not None and depth >= self.maxDepth:
+            return
+        for prop, child in children:
+            self._export(child, prop, record_id, depth + 1)
+        if _isCollection(obj):
+            for index, item in enumerate(obj, 1):
+                self._export(item, str(index), record_id, depth + 1)
+
+
+def exportTree(
+    obj: Any,
+    path: Union[str, PLPath],
+    format: Optional[str] = None,
+    maxDepth: Optional[int] = None,
+    fields: Optional[Mapping[str, Collection[str]]] = None,
+) -> int:
+    format = _format(path, format)
+    if format == "msgpack":
+        with open(path, "wb") as file:
+            return StreamExporter(file, format, maxDepth, fields).export(obj)
+    with open(path, "w", encoding="utf-8") as file:
+        return StreamExporter(file, format, maxDepth, fields).export(obj)
+
+
+def readExport(
+    path: Union[str, PLPath],
+    format: Optional[str] = None,
+    types: Optional[Collection[str]] = None,
+    maxDepth: Optional[int] = None,
+) -> Iterator[dict[str, Any]]:
+    format = _format(path, format)
+    if format == "msgpack":
+        with open(path, "rb") as file:
+            records: Iterator[dict[str, Any]] = msgpack.Unpacker(file, raw=False)
+            yield from _filter(records, types, maxDepth)
+    else:
+        with open(path, encoding="utf-8") as file:
+            yield from _filter((json.loads(line) for line in file), types, maxDepth)
+
+
+def _filter(
+    records: Iterator[dict[str, Any]],
+    types: Optional[Collection[str]],
+    maxDepth: Optional[int],
+) -> Iterator[dict[str, Any]]:
+    for record in records:
+        if types is not None and record["type"] not in types:
+            continue
+        if maxDepth is not None and record["depth"] > maxDepth:
+            continue
+        yield record
@@ -0,0 +1,403 @@
+import sqlite3
+from pathlib import Path as PLPath
+from time import time
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from .common import Verdict
+
+SCHEMA = """
+PRAGMA auto_vacuum = INCREMENTAL;
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    configuration TEXT NOT NULL,
+    testcfg TEXT NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS runs_job ON runs (configuration, testcfg, id);
+CREATE TABLE IF NOT EXISTS results (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    element TEXT NOT NULL,
+    title TEXT,
+    verdict INTEGER NOT NULL,
+    duration REAL,
+    PRIMARY KEY (run, element)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_element ON results (element, run);
+CREATE TABLE IF NOT EXISTS summary (
+    configuration TEXT NOT NULL,
+    testcfg TEXT NOT NULL,
+    element TEXT NOT NULL,
+    title TEXT,
+    runs INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    transitions INTEGER NOT NULL,
+    lastVerdict INTEGER,
+    durationCount INTEGER NOT NULL,
+    durationTotal REAL NOT NULL,
+    PRIMARY KEY (configuration, testcfg, element)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS transitions (
+    configuration TEXT NOT NULL,
+    testcfg TEXT NOT NULL,
+    element TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    previous INTEGER NOT NULL,
+    verdict INTEGER NOT NULL,
+    PRIMARY KEY (configuration, testcfg, element, run)
+) WITHOUT ROWID;
+"""
+
+# Verdicts that say something about the element, NotAvailable/None mean "not run".
+_OUTCOME = {
+    Verdict.VerdictPassed: "pass",
+    Verdict.VerdictFailed: "fail",
+    Verdict.VerdictErrorInTestSystem: "fail",
+    Verdict.VerdictInconclusive: "inconclusive",
+}
+
+
+def _outcome(verdict: Optional[int]) -> Optional[str]:
+    return None if verdict is None else _OUTCOME.get(Verdict(verdict))
+
+
+def walkResults(testcfg: Any) -> Iterator[tuple[str, str, Verdict]]:
+    def walk(elements: Any) -> Iterator[tuple[str, str, Verdict]]:
+        for element in elements:
+            element_id = element.Id
+            if element_id:
+                yield element_id, element.Title, element.Verdict
+            children = element.Elements
+            if children.Count:
+                yield from walk(children)
+
+    for unit in testcfg.TestUnits:
+        if unit.Id:
+            yield unit.Id, unit.Name, unit.Verdict
+        if unit.Elements is not None:
+            yield from walk(unit.Elements)
+
+
+Job = tuple[str, str, str]
+
+
+class FlakinessStats:
+    def __init__(
+        self, configuration: str, testcfg: str, element: str, title: Optional[str]
+    ) -> None:
+        self.configuration = configuration
+        self.testcfg = testcfg
+        self.element = element
+        self.title = title
+        self.runs = 0
+        self.failures = 0
+        self.transitions = 0
+        self._last: Optional[str] = None
+
+    @property
+    def key(self) -> Job:
+        return self.configuration, self.testcfg, self.element
+
+    @property
+    def failureRate(self) -> float:
+        return self.failures / self.runs if self.runs else 0.0
+
+    @property
+    def flakiness(self) -> float:
+        return self.transitions / (self.runs - 1) if self.runs > 1 else 0.0
+
+    def add(self, verdict: Optional[int]) -> None:
+        outcome = _outcome(verdict)
+        if outcome is None:
+            return
+        self.runs += 1
+        self.failures += outcome == "fail"
+        if self._last is not None and outcome != self._last:
+            self.transitions += 1
+        self._last = outcome
+
+    def __repr__(self) -> str:
+        return (
+            f"FlakinessStats(configuration={self.configuration!r}, "
+            f"testcfg={self.testcfg!r}, element={self.element!r}, "
+            f"title={self.title!r}, runs={self.runs}, "
+            f"failureRate={self.failureRate:.3f}, flakiness={self.flakiness:.3f})"
+        )
+
+
+class ResultHistory:
+    def __init__(self, path: Union[str, PLPath] = ":memory:") -> None:
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "ResultHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def ingestResults(
+        self,
+        configuration: str,
+        testcfg: str,
+        results: Iterable[tuple[str, str, Verdict]],
+        durations: Optional[Mapping[str, float]] = None,
+        started: Optional[float] = None,
+        finished: Optional[float] = None,
+    ) -> int:
+        durations = durations or {}
+        with self._db:
+            run = self._db.execute(
+                "INSERT INTO runs (configuration, testcfg, started, finished) "
+                "VALUES (?, ?, ?, ?)",
+                (configuration, testcfg, started, finished or time()),
+            ).lastrowid
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (
+                    (run, element, title, int(verdict), durations.get(element))
+                    for element, title, verdict in results
+                ),
+            )
+        assert run is not None
+        return run
+
+    def ingest(
+        self,
+        configuration: str,
+        testcfg: Any,
+        durations: Optional[Mapping[str, float]] = None,
+        started: Optional[float] = None,
+        finished: Optional[float] = None,
+    ) -> int:
+        return self.ingestResults(
+            configuration,
+            testcfg.Name,
+            walkResults(testcfg),
+            durations,
+            started,
+            finished,
+        )
+
+    def _jobFilter(
+        self, configuration: Optional[str], testcfg: Optional[str], table: str
+    ) -> tuple[str, list[Any]]:
+        clauses, params = [], []
+        if configuration is not None:
+            clauses.append(f"{table}.configuration = ?")
+            params.append(configuration)
+        if testcfg is not None:
+            clauses.append(f"{table}.testcfg = ?")
+            params.append(testcfg)
+        return (" AND ".join(clauses) or "1"), params
+
+    def flakiness(
+        self,
+        configuration: Optional[str] = None,
+        testcfg: Optional[str] = None,
+        minRuns: int = 2,
+    ) -> list[FlakinessStats]:
+        # The same element Id in another test configuration is a different test.
+        stats: dict[Job, FlakinessStats] = {}
+        where, params = self._jobFilter(configuration, testcfg, "summary")
+        for row in self._db.execute(
+            "SELECT configuration, testcfg, element, title, runs, failures, "
+            f"transitions, lastVerdict FROM summary WHERE {where}",
+            params,
+        ):
+            cfg, tc, element, title, runs, failures, transitions, last = row
+            entry = stats.setdefault(
+                (cfg, tc, element), FlakinessStats(cfg, tc, element, title)
+            )
+            entry.runs += runs
+            entry.failures += failures
+            entry.transitions += transitions
+            entry._last = _outcome(last)
+        where, params = self._jobFilter(configuration, testcfg, "runs")
+        for cfg, tc, element, title, verdict in self._db.execute(
+            "SELECT runs.configuration, runs.testcfg, element, title, verdict "
+            f"FROM results JOIN runs ON runs.id = results.run WHERE {where} "
+            "ORDER BY runs.configuration, runs.testcfg, element, run",
+            params,
+        ):
+            entry = stats.setdefault(
+                (cfg, tc, element), FlakinessStats(cfg, tc, element, title)
+            )
+            entry.title = title
+            entry.add(verdict)
+        return sorted(
+            (entry for entry in stats.values() if entry.runs >= minRuns),
+            key=lambda entry: (entry.flakiness, entry.failureRate),
+            reverse=True,
+        )
+
+    def transitions(
+        self, configuration: str, testcfg: str, element: str
+    ) -> list[tuple[int, Verdict, Verdict]]:
+        # Compacted runs leave their changes in the transitions table and the
+        # last verdict in summary, the remaining runs continue from there.
+        job = (configuration, testcfg, element)
+        changes = [
+            (run, Verdict(previous), Verdict(verdict))
+            for run, previous, verdict in self._db.execute(
+                "SELECT run, previous, verdict FROM transitions "
+                "WHERE configuration = ? AND testcfg = ? AND element = ? "
+                "ORDER BY run",
+                job,
+            )
+        ]
+        row = self._db.execute(
+            "SELECT lastVerdict FROM summary "
+            "WHERE configuration = ? AND testcfg = ? AND element = ?",
+            job,
+        ).fetchone()
+        last: Optional[int] = None if row is None else row[0]
+        for run, verdict in self._db.execute(
+            "SELECT run, verdict FROM results JOIN runs ON runs.id = results.run "
+            "WHERE runs.configuration = ? AND runs.testcfg = ? AND element = ? "
+            "ORDER BY run",
+            job,
+        ):
+            if _outcome(verdict) is None:
+                continue
+            if last is not None and _outcome(last) != _outcome(verdict):
+                changes.append((run, Verdict(last), Verdict(verdict)))
+            last = verdict
+        return changes
+
+    def durationPercentiles(
+        self,
+        percentiles: Sequence[float] = (50, 90, 99),
+        configuration: Optional[str] = None,
+        testcfg: Optional[str] = None,
+        element: Optional[str] = None,
+    ) -> dict[Job, dict[float, float]]:
+        where, params = self._jobFilter(configuration, testcfg, "runs")
+        query = (
+            "SELECT runs.configuration, runs.testcfg, element, duration "
+            "FROM results JOIN runs ON runs.id = results.run "
+            f"WHERE duration IS NOT NULL AND {where}"
+        )
+        if element is not None:
+            query += " AND element = ?"
+            params.append(element)
+        result: dict[Job, dict[float, float]] = {}
+        current: Optional[Job] = None
+        values: list[float] = []
+
+        def flush() -> None:
+            if current is not None and values:
+                result[current] = {
+                    p: values[min(len(values) - 1, int(p / 100 * len(values)))]
+                    for p in percentiles
+                }
+
+        for cfg, tc, row_element, duration in self._db.execute(
+            query + " ORDER BY runs.configuration, runs.testcfg, element, duration",
+            params,
+        ):
+            if (cfg, tc, row_element) != current:
+                flush()
+                current, values = (cfg, tc, row_element), []
+            values.append(duration)
+        flush()
+        return result
+
+    def meanDurations(
+        self, configuration: Optional[str] = None, testcfg: Optional[str] = None
+    ) -> dict[Job, float]:
+        where, params = self._jobFilter(configuration, testcfg, "summary")
+        means = {
+            (cfg, tc, element): (count, total)
+            for cfg, tc, element, count, total in self._db.execute(
+                "SELECT configuration, testcfg, element, durationCount, "
+                f"durationTotal FROM summary WHERE {where}",
+                params,
+            )
+        }
+        where, params = self._jobFilter(configuration, testcfg, "runs")
+        for cfg, tc, element, count, total in self._db.execute(
+            "SELECT runs.configuration, runs.testcfg, element, COUNT(duration), "
+            "TOTAL(duration) FROM results JOIN runs ON runs.id = results.run "
+            f"WHERE duration IS NOT NULL AND {where} "
+            "GROUP BY runs.configuration, runs.testcfg, element",
+            params,
+        ):
+            old_count, old_total = means.get((cfg, tc, element), (0, 0.0))
+            means[(cfg, tc, element)] = (old_count + count, old_total + total)
+        return {key: total / count for key, (count, total) in means.items() if count}
+
+    def compact(
+        self, keepRuns: int = 500, batch: int = 50, vacuumPages: int = 256
+    ) -> int:
+        compacted = 0
+        with self._db:
+            jobs = self._db.execute(
+                "SELECT configuration, testcfg, COUNT(*) FROM runs "
+                "GROUP BY configuration, testcfg HAVING COUNT(*) > ?",
+                (keepRuns,),
+            ).fetchall()
+            for configuration, testcfg, count in jobs:
+                if compacted >= batch:
+                    break
+                limit = min(count - keepRuns, batch - compacted)
+                runs = [
+                    run
+                    for (run,) in self._db.execute(
+                        "SELECT id FROM runs WHERE configuration = ? AND testcfg = ? "
+                        "ORDER BY id LIMIT ?",
+                        (configuration, testcfg, limit),
+                    )
+                ]
+                self._fold(configuration, testcfg, runs)
+                compacted += len(runs)
+        self._db.execute(f"PRAGMA incremental_vacuum({int(vacuumPages)})")
+        return compacted
+
+    def _fold(self, configuration: str, testcfg: str, runs: list[int]) -> None:
+        marks = ",".join("?" * len(runs))
+        summaries: dict[str, list[Any]] = {
+            row[0]: list(row[1:])
+            for row in self._db.execute(
+                "SELECT element, title, runs, failures, transitions, lastVerdict, "
+                "durationCount, durationTotal FROM summary "
+                "WHERE configuration = ? AND testcfg = ?",
+                (configuration, testcfg),
+            )
+        }
+        changes: list[tuple[str, int, int, int]] = []
+        for element, run, title, verdict, duration in self._db.execute(
+            f"SELECT element, run, title, verdict, duration FROM results "
+            f"WHERE run IN ({marks}) ORDER BY element, run",
+            runs,
+        ):
+            entry = summaries.setdefault(element, [title, 0, 0, 0, None, 0, 0.0])
+            entry[0] = title
+            outcome = _outcome(verdict)
+            if outcome is not None:
+                entry[1] += 1
+                entry[2] += outcome == "fail"
+                if entry[4] is not None and _outcome(entry[4]) != outcome:
+                    entry[3] += 1
+                    changes.append((element, run, entry[4], verdict))
+                entry[4] = verdict
+            if duration is not None:
+                entry[5] += 1
+                entry[6] += duration
+        self._db.executemany(
+            "INSERT OR REPLACE INTO summary VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (configuration, testcfg, element, *entry)
+                for element, entry in summaries.items()
+            ),
+        )
+        self._db.executemany(
+            "INSERT OR REPLACE INTO transitions VALUES (?, ?, ?, ?, ?, ?)",
+            ((configuration, testcfg, *change) for change in changes),
+        )
+        self._db.execute(f"DELETE FROM results WHERE run IN ({marks})", runs)
+        self._db.execute(f"DELETE FROM runs WHERE id IN ({marks})", runs)
@@ -0,0 +1,217 @@
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import struct
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path as PLPath
+from time import perf_counter
+from typing import Any, Iterable, Optional, Union
+
+from .common import LatencyStats
+
+LOG = logging.getLogger("VectorCOM")
+
+LOG_SUFFIXES = (".blf", ".asc")
+
+BLF_HEADER = struct.Struct("<4sLBBBBBBBBQQLL8H8H")
+
+ASC_TAIL = 64 * 1024
+
+_ASC_EVENT = re.compile(rb"^\s*(\d+\.\d+)\s")
+
+
+def _systemTime(fields: tuple[int, ...]) -> Optional[str]:
+    year, month, _, day, hour, minute, second, millis = fields
+    try:
+        return datetime(
+            year, month, day, hour, minute, second, millis * 1000
+        ).isoformat()
+    except ValueError:
+        return None
+
+
+def _indexBlf(path: PLPath, index: dict[str, Any]) -> None:
+    with open(path, "rb") as file:
+        data = file.read(BLF_HEADER.size)
+    if len(data) < BLF_HEADER.size:
+        raise ValueError(f"{path} is too short for a BLF header")
+    fields = BLF_HEADER.unpack(data)
+    if fields[0] != b"LOGG":
+        raise ValueError(f"{path} is not a BLF file")
+    index["application"] = list(fields[2:6])
+    index["uncompressedSize"] = fields[11]
+    index["objectCount"] = fields[12]
+    index["start"] = _systemTime(fields[14:22])
+    index["stop"] = _systemTime(fields[22:30])
+
+
+def _indexAsc(path: PLPath, index: dict[str, Any]) -> None:
+    first = last = None
+    with open(path, "rb") as file:
+        for line in file:
+            if line.startswith(b"date "):
+                index["date"] = line[5:].strip().decode("latin-1")
+            match = _ASC_EVENT.match(line)
+            if match:
+                first = float(match.group(1))
+                break
+        # Only the tail is needed for the last timestamp, not the whole file.
+        file.seek(max(file.tell(), os.path.getsize(path) - ASC_TAIL))
+        for line in file.read().splitlines():
+            match = _ASC_EVENT.match(line)
+            if match:
+                last = float(match.group(1))
+    index["first"] = first
+    index["last"] = last if last is not None else first
+
+
+def indexLog(path: Union[str, PLPath]) -> dict[str, Any]:
+    path = PLPath(path)
+    index: dict[str, Any] = {
+        "path": str(path),
+        "format": path.suffix.lower().lstrip("."),
+        "size": path.stat().st_size,
+    }
+    if index["format"] == "blf":
+        _indexBlf(path, index)
+    elif index["format"] == "asc":
+        _indexAsc(path, index)
+    return index
+
+
+def compressLog(path: Union[str, PLPath], level: int = 6) -> PLPath:
+    path = PLPath(path)
+    target = path.with_name(path.name + ".gz")
+    tmp = target.with_name(target.name + ".tmp")
+    with open(path, "rb") as source, gzip.open(tmp, "wb", compresslevel=level) as sink:
+        shutil.copyfileobj(source, sink, 1 << 20)
+    tmp.replace(target)
+    return target
+
+
+def processLog(
+    path: Union[str, PLPath], compress: bool = True, level: int = 6, keep: bool = False
+) -> dict[str, Any]:
+    start = perf_counter()
+    path = PLPath(path)
+    index = indexLog(path)
+    if compress:
+        target = compressLog(path, level)
+        index["compressed"] = str(target)
+        index["compressedSize"] = target.stat().st_size
+        if not keep:
+            path.unlink()
+    index["duration"] = perf_counter() - start
+    return index
+
+
+class PipelineMetrics:
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queueDepth = 0
+        self.maxQueueDepth = 0
+        self.bytesIn = 0
+        self.bytesOut = 0
+        self.fileTime = LatencyStats()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    @property
+    def throughput(self) -> float:
+        if self._started is None or self._finished is None:
+            return 0.0
+        elapsed = self._finished - self._started
+        return self.bytesIn / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"PipelineMetrics(queueDepth={self.queueDepth}, "
+            f"maxQueueDepth={self.maxQueueDepth}, submitted={self.submitted}, "
+            f"completed={self.completed}, failed={self.failed}, "
+            f"bytesIn={self.bytesIn}, bytesOut={self.bytesOut}, "
+            f"throughput={self.throughput / 1e6:.1f}MB/s, fileTime={self.fileTime!r})"
+        )
+
+
+class LogPipeline:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        compress: bool = True,
+        level: int = 6,
+        keepOriginal: bool = False,
+        indexPath: Optional[Union[str, PLPath]] = None,
+    ) -> None:
+        self.compress = compress
+        self.level = level
+        self.keepOriginal = keepOriginal
+        self.indexPath = None if indexPath is None else PLPath(indexPath)
+        self.metrics = PipelineMetrics()
+        self.results: list[dict[str, Any]] = []
+        self._pool = ProcessPoolExecutor(workers)
+        self._lock = threading.Lock()
+
+    def submit(self, path: Union[str, PLPath]) -> Future:
+        future = self._pool.submit(
+            processLog, str(path), self.compress, self.level, self.keepOriginal
+        )
+        with self._lock:
+            metrics = self.metrics
+            if metrics._started is None:
+                metrics._started = perf_counter()
+            metrics.submitted += 1
+            metrics.queueDepth += 1
+            metrics.maxQueueDepth = max(metrics.maxQueueDepth, metrics.queueDepth)
+        future.add_done_callback(self._done)
+        return future
+
+    def submitRun(self, directory: Union[str, PLPath]) -> list[Future]:
+        return [
+            self.submit(path)
+            for path in sorted(PLPath(directory).iterdir())
+            if path.suffix.lower() in LOG_SUFFIXES
+        ]
+
+    def submitAll(self, paths: Iterable[Union[str, PLPath]]) -> list[Future]:
+        return [self.submit(path) for path in paths]
+
+    def _done(self, future: Future) -> None:
+        try:
+            index = future.result()
+        except Exception as exc:
+            index = None
+            LOG.error("Log post-processing failed: %s", exc)
+        with self._lock:
+            metrics = self.metrics
+            metrics.queueDepth -= 1
+            metrics._finished = perf_counter()
+            if index is None:
+                metrics.failed += 1
+                return
+            metrics.completed += 1
+            metrics.bytesIn += index["size"]
+            metrics.bytesOut += index.get("compressedSize", index["size"])
+            metrics.fileTime.record(index["duration"])
+            self.results.append(index)
+            if self.indexPath is not None:
+                with open(self.indexPath, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(index) + "\n")
+        LOG.debug("Processed %s in %.2fs", index["path"], index["duration"])
+
+    def close(self, wait: bool = True) -> PipelineMetrics:
+        self._pool.shutdown(wait)
+        LOG.info("%r", self.metrics)
+        return self.metrics
+
+    def __enter__(self) -> "LogPipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
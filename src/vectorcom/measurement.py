@@ -2,15 +2,18 @@ import logging
 from typing import Callable, ClassVar, cast
 
 import rich.repr
-from win32com.client import CDispatch, WithEvents
+from win32com.client import CDispatch
 
+from .apartment import withEvents
+from .callbacks import dispatchCallback
 from .common import RefBool, waitEventFinished
+from .comproperty import ComObject, ComProperty
 
 LOG = logging.getLogger("VectorCOM")
 
 
 @rich.repr.auto
-class Measurement:
+class Measurement(ComObject):
     class _Events:
         OnExitCbk: ClassVar[Callable[..., None]] = lambda: LOG.debug(
             "Exiting measurement ..."
@@ -25,95 +28,118 @@ class Measurement:
             "Stopping measurement ..."
         )
 
-        OnExitFinished: ClassVar[RefBool] = RefBool(True)
-        OnInitFinished: ClassVar[RefBool] = RefBool(True)
-        OnStartFinished: ClassVar[RefBool] = RefBool(True)
-        OnStopFinished: ClassVar[RefBool] = RefBool(True)
-
-        @classmethod
-        def OnExit(cls):
-            cls.OnExitCbk()
-            cls.OnExitFinished.true
-
-        @classmethod
-        def OnInit(cls):
-            cls.OnInitCbk()
-            cls.OnInitFinished.true
-
-        @classmethod
-        def OnStart(cls):
-            cls.OnStartCbk()
-            cls.OnStartFinished.true
+        OnExitFinished: RefBool
+        OnInitFinished: RefBool
+        OnStartFinished: RefBool
+        OnStopFinished: RefBool
+        OnExitHooks: list[Callable[[], None]]
+        OnInitHooks: list[Callable[[], None]]
+
+        def __init__(self):
+            self.OnExitFinished = RefBool(True)
+            self.OnInitFinished = RefBool(True)
+            self.OnStartFinished = RefBool(True)
+            self.OnStopFinished = RefBool(True)
+            self.OnExitHooks = []
+            self.OnInitHooks = []
+
+        @staticmethod
+        def _runHooks(hooks: list[Callable[[], None]]):
+            # Hooks run inside the COM event, e.g. CAPL GetFunction is only
+            # allowed while OnInit is being handled.
+            for hook in hooks:
+                try:
+                    hook()
+                except Exception:
+                    LOG.exception("Measurement hook %r failed", hook)
+
+        def OnExit(self):
+            self._runHooks(self.OnExitHooks)
+            self.OnExitFinished.true
+            dispatchCallback(type(self).OnExitCbk)
+
+        def OnInit(self):
+            self._runHooks(self.OnInitHooks)
+            self.OnInitFinished.true
+            dispatchCallback(type(self).OnInitCbk)
+
+        def OnStart(self):
+            self.OnStartFinished.true
+            dispatchCallback(type(self).OnStartCbk)
+
+        def OnStop(self):
+            self.OnStopFinished.true
+            dispatchCallback(type(self).OnStopCbk)
+
+    __slots__ = ("events",)
+
+    events: _Events
+
+    AnimationDelay = ComProperty[int](writable=True)
+    MeasurementIndex = ComProperty[int](writable=True)
+    Running = ComProperty[bool](writable=True)
+
+    def Animate(self):
+        self._com.Animate()
+
+    def Break(self):
+        self._com.Break()
+
+    def Reset(self):
+        self._com.Reset()
+
+    def Start(self):
+        if self.Running:
+            return
+        self.events.OnStartFinished.false
+        self._com.Start()
+        waitEventFinished(self.events.OnStartFinished)
 
-        @classmethod
-        def OnStop(cls):
-            cls.OnStopCbk()
-            cls.OnStopFinished.true
+    def Step(self):
+        self._com.Step()
 
-    _com: ClassVar[CDispatch]
-    events: ClassVar[_Events]
+    def StopEx(self):
+        if not self.Running:
+            return
+        self.events.OnStopFinished.false
+        self._com.StopEx()
+        waitEventFinished(self.events.OnStopFinished)
 
     @property
-    def AnimationDelay(self) -> int:
-        return self._com.AnimationDelay
+    def OnExit(self) -> Callable[[], None]:
+        return self._Events.OnExitCbk
 
-    @AnimationDelay.setter
-    def AnimationDelay(self, new_value: int):
-        self._com.AnimationDelay = new_value
+    @OnExit.setter
+    def OnExit(self, callback: Callable[[], None]) -> None:
+        self._Events.OnExitCbk = callback
 
     @property
-    def MeasurementIndex(self) -> int:
-        return self._com.MeasurementIndex
+    def OnInit(self) -> Callable[[], None]:
+        return self._Events.OnInitCbk
 
-    @MeasurementIndex.setter
-    def MeasurementIndex(self, new_value: int):
-        self._com.MeasurementIndex = new_value
+    @OnInit.setter
+    def OnInit(self, callback: Callable[[], None]) -> None:
+        self._Events.OnInitCbk = callback
 
     @property
-    def Running(self) -> bool:
-        return self._com.Running
-
-    @Running.setter
-    def Running(self, new_value: bool):
-        self._com.Running = new_value
-
-    @classmethod
-    def Animate(cls):
-        cls._com.Animate()
+    def OnStart(self) -> Callable[[], None]:
+        return self._Events.OnStartCbk
 
-    @classmethod
-    def Break(cls):
-        cls._com.Break()
+    @OnStart.setter
+    def OnStart(self, callback: Callable[[], None]) -> None:
+        self._Events.OnStartCbk = callback
 
-    @classmethod
-    def Reset(cls):
-        cls._com.Reset()
-
-    @classmethod
-    def Start(cls):
-        if cls.Running:
-            return
-        cls.events.OnStartFinished.false
-        cls._com.Start()
-        waitEventFinished(cls.events.OnStartFinished)
-
-    @classmethod
-    def Step(cls):
-        cls._com.Step()
+    @property
+    def OnStop(self) -> Callable[[], None]:
+        return self._Events.OnStopCbk
 
-    @classmethod
-    def StopEx(cls):
-        if not cls.Running:
-            return
-        cls.events.OnStopFinished.false
-        cls._com.StopEx()
-        waitEventFinished(cls.events.OnStopFinished)
+    @OnStop.setter
+    def OnStop(self, callback: Callable[[], None]) -> None:
+        self._Events.OnStopCbk = callback
 
     def __init__(self, measurement: CDispatch) -> None:
-        Measurement._com = measurement
-        Measurement.events = cast(
-            Measurement._Events, WithEvents(measurement, self._Events)
-        )
+        super().__init__(measurement)
+        self.events = cast(Measurement._Events, withEvents(measurement, self._Events))
 
     def __rich_repr__(self):
         yield "AnimationDelay", self.AnimationDelay
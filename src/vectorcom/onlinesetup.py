@@ -0,0 +1,126 @@
+from datetime import datetime
+from pathlib import Path as PLPath
+from typing import Optional, Union
+
+import rich.repr
+from win32com.client import CDispatch
+
+from .comproperty import ComObject, ComProperty
+
+
+@rich.repr.auto
+class LoggingTrigger(ComObject):
+    __slots__ = ()
+
+    Active = ComProperty[bool](writable=True)
+    Mode = ComProperty[int](writable=True)
+    PostTriggerTime = ComProperty[int](writable=True)
+    PreTriggerTime = ComProperty[int](writable=True)
+
+    def Start(self) -> None:
+        self._com.Start()
+
+    def Stop(self) -> None:
+        self._com.Stop()
+
+    def __init__(self, trigger: CDispatch) -> None:
+        super().__init__(trigger)
+
+    def __rich_repr__(self):
+        yield "Active", self.Active
+        yield "Mode", self.Mode
+        yield "PostTriggerTime", self.PostTriggerTime
+        yield "PreTriggerTime", self.PreTriggerTime
+
+
+@rich.repr.auto
+class Logging(ComObject):
+    __slots__ = ()
+
+    FullName = ComProperty[str](writable=True)
+    Trigger = ComProperty(LoggingTrigger)
+
+    @property
+    def Enabled(self) -> bool:
+        return self.Trigger.Active
+
+    @Enabled.setter
+    def Enabled(self, value: bool) -> None:
+        self.Trigger.Active = value
+
+    def __init__(self, logging: CDispatch) -> None:
+        super().__init__(logging)
+
+    def __rich_repr__(self):
+        yield "FullName", self.FullName
+        yield self.Trigger
+
+
+@rich.repr.auto
+class LoggingCollection(ComObject):
+    __slots__ = ()
+
+    Count = ComProperty[int]()
+
+    def Item(self, index: int) -> Logging:
+        return Logging(self._com.Item(index))
+
+    def Add(self, fullName: str) -> Logging:
+        return Logging(self._com.Add(fullName))
+
+    def Remove(self, index: int) -> None:
+        self._com.Remove(index)
+
+    def __init__(self, loggings: CDispatch) -> None:
+        super().__init__(loggings)
+
+    def __iter__(self):
+        for i in range(1, self.Count + 1):
+            yield self.Item(i)
+
+    def __getitem__(self, index: int) -> Logging:
+        return self.Item(index)
+
+    def __rich_repr__(self):
+        yield "Count", self.Count
+        yield list(self)
+
+
+@rich.repr.auto
+class OnlineSetup(ComObject):
+    __slots__ = ()
+
+    LoggingCollection = ComProperty(LoggingCollection)
+
+    def __init__(self, onlinesetup: CDispatch) -> None:
+        super().__init__(onlinesetup)
+
+    def __rich_repr__(self):
+        yield self.LoggingCollection
+
+
+def prepareRun(
+    loggings: LoggingCollection,
+    root: Union[str, PLPath],
+    run: Optional[str] = None,
+    pattern: Optional[str] = None,
+) -> PLPath:
+    directory = PLPath(root) / (run or datetime.now().strftime("%Y%m%d-%H%M%S"))
+    directory.mkdir(parents=True, exist_ok=True)
+    enabled = [
+        (index, logging)
+        for index, logging in enumerate(loggings, start=1)
+        if logging.Enabled
+    ]
+    if pattern and "{index}" not in pattern and len(enabled) > 1:
+        # Every block would otherwise write to the same file.
+        stem = PLPath(pattern)
+        pattern = str(stem.with_name(f"{stem.stem}_{{index}}{stem.suffix}"))
+    for index, logging in enabled:
+        # Not str.format: CANoe field functions like {IncMeasurement} must stay.
+        if pattern:
+            name = pattern.replace("{index}", str(index))
+        else:
+            name = PLPath(logging.FullName).name
+        logging.FullName = str(directory / name)
+    return directory
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path as PLPath
+from statistics import median
+from time import perf_counter
+from typing import Any, Iterator, Optional, Union
+
+from .common import TestElementType, Verdict, waitEventFinished
+from .testconfiguration import TestConfiguration
+from .testtree import TestTreeElement, TestTreeElements
+
+LOG = logging.getLogger("VectorCOM")
+
+# Verdicts a case only has once it ran to the end. VerdictNone is also shown by
+# cases that are running or did not run, so it does not count.
+OUTCOMES = frozenset(
+    {
+        Verdict.VerdictPassed,
+        Verdict.VerdictFailed,
+        Verdict.VerdictInconclusive,
+        Verdict.VerdictErrorInTestSystem,
+    }
+)
+
+
+class ProfileNode:
+    def __init__(
+        self,
+        name: str,
+        kind: Optional[TestElementType],
+        elementId: Optional[str],
+        parent: Optional[ProfileNode] = None,
+        element: Optional[TestTreeElement] = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.elementId = elementId
+        self.parent = parent
+        self.element = element
+        self.children: list[ProfileNode] = []
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.verdict: Optional[Verdict] = None
+        # Number of cases the same poll interval was split between; 1 means the
+        # duration is exact to one waitstep.
+        self.shared = 0
+        if parent is not None:
+            parent.children.append(self)
+
+    @property
+    def path(self) -> tuple[str, ...]:
+        node: Optional[ProfileNode] = self
+        names: list[str] = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return tuple(reversed(names))
+
+    @property
+    def key(self) -> str:
+        return self.elementId or "/".join(self.path)
+
+    @property
+    def duration(self) -> float:
+        if not self.children:
+            if self.start is None or self.end is None:
+                return 0.0
+            return self.end - self.start
+        return sum(child.duration for child in self.children)
+
+    @property
+    def span(self) -> tuple[Optional[float], Optional[float]]:
+        if not self.children:
+            return self.start, self.end
+        starts = [s for s, _ in (c.span for c in self.children) if s is not None]
+        ends = [e for _, e in (c.span for c in self.children) if e is not None]
+        return (min(starts) if starts else None, max(ends) if ends else None)
+
+    def leaves(self) -> Iterator[ProfileNode]:
+        if not self.children:
+            yield self
+        for child in self.children:
+            yield from child.leaves()
+
+    def walk(self) -> Iterator[ProfileNode]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class TestProfiler:
+    def __init__(
+        self, testcfg: TestConfiguration, waitstep: float = 0.1, lookahead: int = 8
+    ) -> None:
+        self.testcfg = testcfg
+        self.waitstep = waitstep
+        self.lookahead = lookahead
+        self.root: Optional[ProfileNode] = None
+        self._pending: list[ProfileNode] = []
+        self._origin = 0.0
+        self._last = 0.0
+
+    def snapshot(self) -> ProfileNode:
+        self.root = ProfileNode(
+            self.testcfg.Name, TestElementType.TestConfiguration, self.testcfg.Id
+        )
+        for unit in self.testcfg.TestUnits:
+            if not unit.Enabled:
+                continue
+            node = ProfileNode(unit.Name, unit.Type, unit.Id, self.root)
+            if unit.Elements is not None:
+                self._addElements(node, unit.Elements)
+        self._pending = [
+            leaf for leaf in self.root.leaves() if leaf.element is not None
+        ]
+        return self.root
+
+    def _addElements(self, parent: ProfileNode, elements: TestTreeElements) -> None:
+        for element in elements:
+            if not element.Enabled:
+                continue
+            node = ProfileNode(
+                element.Caption or element.Title,
+                element.Type,
+                element.Id,
+                parent,
+                element,
+            )
+            children = element.Elements
+            if children.Count:
+                self._addElements(node, children)
+
+    def begin(self) -> None:
+        self._origin = self._last = perf_counter()
+
+    def sample(self, lookahead: Optional[int] = None) -> int:
+        # CANoe reports no per-case start or stop over COM, so durations are
+        # estimates: the time since the previous sample is split evenly
+        # between the cases that reached an outcome in between.
+        window = self._pending[: lookahead or self.lookahead]
+        finished: list[tuple[ProfileNode, Verdict]] = []
+        last = -1
+        for position, leaf in enumerate(window):
+            if leaf.element is None:
+                continue
+            verdict = leaf.element.Verdict
+            if verdict in OUTCOMES:
+                finished.append((leaf, verdict))
+                last = position
+        if not finished:
+            return 0
+        # Leaves overtaken by a finished one did not run to an outcome; they
+        # keep their verdict but get no timing, and no longer block the window.
+        for leaf in window[:last]:
+            if leaf.end is None and leaf.element is not None:
+                leaf.verdict = leaf.element.Verdict
+        del self._pending[: last + 1]
+        now = perf_counter()
+        share = (now - self._last) / len(finished)
+        for index, (leaf, verdict) in enumerate(finished):
+            leaf.start = self._last + index * share
+            leaf.end = leaf.start + share
+            leaf.verdict = verdict
+            leaf.shared = len(finished)
+        self._last = now
+        return len(finished)
+
+    def finish(self) -> None:
+        self.sample(len(self._pending))
+        self._pending = []
+
+    def run(self, timeout: float = 0) -> ProfileNode:
+        root = self.snapshot()
+        self.testcfg.Start()
+        self.begin()
+
+        def poll() -> None:
+            self.sample()
+
+        waitEventFinished(
+            self.testcfg.events.OnStopFinished, timeout, self.waitstep, poll
+        )
+        self.finish()
+        LOG.debug(
+            "Profiled %s: %.3fs over %d test cases",
+            self.testcfg.Name,
+            root.duration,
+            sum(1 for leaf in root.leaves() if leaf.end is not None),
+        )
+        return root
+
+    def _root(self) -> ProfileNode:
+        if self.root is None:
+            raise RuntimeError("Nothing profiled yet")
+        return self.root
+
+    def collapsed(self) -> Iterator[str]:
+        for leaf in self._root().leaves():
+            if leaf.end is None:
+                continue
+            frames = ";".join(name.replace(";", ",") for name in leaf.path)
+            yield f"{frames} {round(leaf.duration * 1e6)}"
+
+    def writeCollapsed(self, path: Union[str, PLPath]) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            for line in self.collapsed():
+                file.write(line + "\n")
+
+    def speedscope(self) -> dict[str, Any]:
+        root = self._root()
+        frames: list[dict[str, str]] = []
+        index: dict[tuple[str, ...], int] = {}
+        events: list[dict[str, Any]] = []
+
+        def emit(node: ProfileNode) -> None:
+            start, end = node.span
+            if start is None or end is None:
+                return
+            if node.path not in index:
+                index[node.path] = len(frames)
+                frames.append({"name": node.name})
+            frame = index[node.path]
+            events.append({"type": "O", "frame": frame, "at": start - self._origin})
+            for child in sorted(
+                node.children, key=lambda child: child.span[0] or float("inf")
+            ):
+                emit(child)
+            events.append({"type": "C", "frame": frame, "at": end - self._origin})
+
+        emit(root)
+        end_value = events[-1]["at"] if events else 0.0
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": root.name,
+            "exporter": "vectorcom",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "evented",
+                    "name": root.name,
+                    "unit": "seconds",
+                    "startValue": 0.0,
+                    "endValue": end_value,
+                    "events": events,
+                }
+            ],
+        }
+
+    def writeSpeedscope(self, path: Union[str, PLPath]) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.speedscope(), file)
+
+
+class ProfileHistory:
+    def __init__(self, path: Union[str, PLPath], maxEntries: int = 50) -> None:
+        self.path = PLPath(path)
+        self.maxEntries = maxEntries
+        self.cases: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as file:
+                self.cases = json.load(file)
+
+    def durations(self, key: str) -> list[float]:
+        return self.cases.get(key, {}).get("durations", [])
+
+    def median(self, key: str) -> Optional[float]:
+        durations = self.durations(key)
+        return median(durations) if durations else None
+
+    def medians(self) -> dict[str, float]:
+        return {
+            key: median(case["durations"])
+            for key, case in self.cases.items()
+            if case["durations"]
+        }
+
+    def regressions(
+        self, root: ProfileNode, factor: float = 1.5, minSeconds: float = 0.5
+    ) -> list[tuple[str, str, float, float]]:
+        slower = []
+        for leaf in root.leaves():
+            previous = self.median(leaf.key)
+            if leaf.end is None or previous is None:
+                continue
+            if leaf.duration > max(previous * factor, previous + minSeconds):
+                slower.append((leaf.key, leaf.name, previous, leaf.duration))
+        return slower
+
+    def record(self, root: ProfileNode) -> None:
+        for leaf in root.leaves():
+            if leaf.end is None:
+                continue
+            case = self.cases.setdefault(leaf.key, {"name": leaf.name, "durations": []})
+            case["name"] = leaf.name
+            case["durations"].append(leaf.duration)
+            del case["durations"][: -self.maxEntries]
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(self.cases, file)
+        tmp.replace(self.path)
@@ -0,0 +1,193 @@
+import logging
+from collections import deque
+from time import perf_counter, sleep
+from typing import Callable, Iterable, Optional, TypeVar
+
+import pywintypes
+
+from .canoe import Canoe
+from .common import LatencyStats, Verdict, waitEventFinished
+from .configuration import PLPath
+from .testconfiguration import TestConfiguration
+
+LOG = logging.getLogger("VectorCOM")
+
+T = TypeVar("T")
+
+
+def _hresult(code: int) -> int:
+    return code - (1 << 32)
+
+
+DISCONNECTED_HRESULTS = frozenset(
+    {
+        _hresult(0x80010007),  # RPC_E_SERVER_DIED
+        _hresult(0x80010012),  # RPC_E_SERVER_DIED_DNE
+        _hresult(0x80010108),  # RPC_E_DISCONNECTED
+        _hresult(0x800401FD),  # CO_E_OBJNOTCONNECTED
+        _hresult(0x800706BA),  # RPC_S_SERVER_UNAVAILABLE
+        _hresult(0x800706BE),  # RPC_S_CALL_FAILED
+        _hresult(0x800706BF),  # RPC_S_CALL_FAILED_DNE
+    }
+)
+
+
+def isDisconnected(exc: BaseException) -> bool:
+    # com_error.args is (hresult, text, excepinfo, argerror).
+    if not isinstance(exc, pywintypes.com_error) or not exc.args:
+        return False
+    return exc.args[0] in DISCONNECTED_HRESULTS
+
+
+class RecoveryError(RuntimeError):
+    pass
+
+
+class RecoveryMetrics:
+    def __init__(self) -> None:
+        self.disconnects = 0
+        self.recoveries = 0
+        self.failedAttempts = 0
+        self.requeued = 0
+        self.recoveryTime = LatencyStats()
+
+    def __repr__(self) -> str:
+        return (
+            f"RecoveryMetrics(disconnects={self.disconnects}, "
+            f"recoveries={self.recoveries}, failedAttempts={self.failedAttempts}, "
+            f"requeued={self.requeued}, recoveryTime={self.recoveryTime!r})"
+        )
+
+
+class CanoeSupervisor:
+    def __init__(
+        self,
+        factory: Callable[[], Canoe] = Canoe,
+        budget: int = 3,
+        attempts: int = 5,
+        backoff: float = 5.0,
+        probeInterval: float = 2.0,
+        budgetWindow: float = 3600.0,
+        openTimeout: float = 300.0,
+    ) -> None:
+        self.factory = factory
+        self.budget = budget
+        self.budgetWindow = budgetWindow
+        self.openTimeout = openTimeout
+        self.attempts = attempts
+        self.backoff = backoff
+        self.probeInterval = probeInterval
+        self.metrics = RecoveryMetrics()
+        self.onRecovered: list[Callable[[Canoe], None]] = []
+        self._path: Optional[PLPath] = None
+        self._measurement = False
+        self._recovered: deque[float] = deque()
+        self._canoe = factory()
+
+    @property
+    def canoe(self) -> Canoe:
+        return self._canoe
+
+    def call(self, fn: Callable[[Canoe], T]) -> T:
+        while True:
+            try:
+                return fn(self._canoe)
+            except Exception as exc:
+                if not isDisconnected(exc):
+                    raise
+                self.recover(exc)
+
+    def Open(self, path: PLPath) -> None:
+        self._path = path
+        self.call(lambda canoe: canoe.Open(path, timeout=self.openTimeout))
+
+    def startMeasurement(self) -> None:
+        self._measurement = True
+        self.call(lambda canoe: canoe.Measurement.Start())
+
+    def stopMeasurement(self) -> None:
+        self._measurement = False
+        self.call(lambda canoe: canoe.Measurement.StopEx())
+
+    def resetBudget(self) -> None:
+        self._recovered.clear()
+
+    def recover(self, cause: Optional[BaseException] = None) -> None:
+        self.metrics.disconnects += 1
+        # The budget limits restarts within the last budgetWindow seconds, so a
+        # long-running supervisor is not stopped by crashes hours apart.
+        now = perf_counter()
+        while self._recovered and now - self._recovered[0] > self.budgetWindow:
+            self._recovered.popleft()
+        if len(self._recovered) >= self.budget:
+            raise RecoveryError(
+                f"CANoe recovery budget exhausted: {len(self._recovered)} restarts "
+                f"in the last {self.budgetWindow:.0f}s"
+            ) from cause
+        LOG.warning("Lost connection to CANoe (%s), reconnecting ...", cause)
+        start = perf_counter()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                canoe = self.factory()
+                if self._path is not None:
+                    canoe.Open(self._path, timeout=self.openTimeout)
+                if self._measurement:
+                    canoe.Measurement.Start()
+                for hook in self.onRecovered:
+                    hook(canoe)
+            except (pywintypes.com_error, TimeoutError) as exc:
+                self.metrics.failedAttempts += 1
+                LOG.warning("Reconnect attempt %d failed: %s", attempt, exc)
+                sleep(self.backoff)
+                continue
+            self._canoe = canoe
+            self._recovered.append(perf_counter())
+            self.metrics.recoveries += 1
+            self.metrics.recoveryTime.record(perf_counter() - start)
+            LOG.info("Recovered CANoe in %.1fs", perf_counter() - start)
+            return
+        raise RecoveryError(
+            f"Could not reconnect to CANoe after {self.attempts} attempts"
+        ) from cause
+
+    def _testConfiguration(self, canoe: Canoe, name: str) -> TestConfiguration:
+        for testcfg in canoe.Configuration.TestConfigurations:
+            if testcfg.Name == name:
+                return testcfg
+        raise KeyError(f"No test configuration named '{name}'")
+
+    def runTestConfigurations(
+        self, names: Iterable[str], timeout: float = 0
+    ) -> dict[str, Verdict]:
+        queue = deque(names)
+        verdicts: dict[str, Verdict] = {}
+
+        def run(canoe: Canoe) -> Verdict:
+            canoe.Measurement.Start()
+            testcfg = self._testConfiguration(canoe, queue[0])
+            testcfg.Start()
+            last_probe = perf_counter()
+
+            def probe() -> None:
+                # A dead server never fires OnStop, so poke it now and then.
+                nonlocal last_probe
+                if perf_counter() - last_probe >= self.probeInterval:
+                    last_probe = perf_counter()
+                    _ = testcfg.Running
+
+            waitEventFinished(testcfg.events.OnStopFinished, timeout, onWait=probe)
+            return testcfg.Verdict
+
+        while queue:
+            try:
+                verdicts[queue[0]] = run(self._canoe)
+            except Exception as exc:
+                if not isDisconnected(exc):
+                    raise
+                LOG.warning("Test configuration '%s' interrupted", queue[0])
+                self.metrics.requeued += 1
+                self._measurement = True
+                self.recover(exc)
+                continue
+            queue.popleft()
+        return verdicts
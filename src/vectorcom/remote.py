@@ -0,0 +1,619 @@
+import inspect
+import ipaddress
+import itertools
+import json
+import logging
+import socket
+import socketserver
+import threading
+from concurrent.futures import Future
+from enum import IntEnum
+from pathlib import PurePath
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Union
+
+from . import common
+from .callbacks import CallbackExecutor
+from .comproperty import ComObject, ComProperty
+
+LOG = logging.getLogger("VectorCOM")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 43871
+
+# A path step is either an attribute name or a method call [name, args].
+Step = Union[str, tuple[str, tuple]]
+Path = tuple[Step, ...]
+
+ENUMS: dict[str, type[IntEnum]] = {}
+
+
+def registerEnums(*enums: type[IntEnum]) -> None:
+    for enum in enums:
+        ENUMS[enum.__name__] = enum
+
+
+registerEnums(common.Verdict, common.TestElementType, common.StopReason)
+try:
+    from .configuration import CfgExeVariant, CfgFDXTL, CfgMode
+except ImportError:  # the COM wrappers need pywin32, remote clients do not
+    pass
+else:
+    registerEnums(CfgMode, CfgExeVariant, CfgFDXTL)
+
+
+class RemoteError(Exception):
+    def __init__(self, kind: str, message: str) -> None:
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+        self.message = message
+
+
+class _Exports:
+    def __init__(self, cls: type) -> None:
+        attributes: set[str] = set()
+        writable: set[str] = set()
+        methods: set[str] = set()
+        # Only what the wrapper classes define is reachable, never anything
+        # from ComObject, object or the values the properties return.
+        for klass in reversed(cls.__mro__):
+            if not issubclass(klass, ComObject) or klass is ComObject:
+                continue
+            for name, attr in vars(klass).items():
+                if name.startswith("_"):
+                    continue
+                if isinstance(attr, ComProperty):
+                    attributes.add(name)
+                    if attr.writable:
+                        writable.add(name)
+                elif isinstance(attr, property):
+                    attributes.add(name)
+                    if attr.fset is not None:
+                        writable.add(name)
+                elif inspect.isfunction(attr):
+                    methods.add(name)
+        self.attributes = frozenset(attributes)
+        self.writable = frozenset(writable)
+        self.methods = frozenset(methods)
+
+
+_EXPORTS: dict[type, _Exports] = {}
+
+
+def _exports(cls: type) -> _Exports:
+    exports = _EXPORTS.get(cls)
+    if exports is None:
+        exports = _EXPORTS[cls] = _Exports(cls)
+    return exports
+
+
+def _remoteObject(value: Any) -> ComObject:
+    if not isinstance(value, ComObject):
+        raise TypeError(f"'{type(value).__name__}' objects are not exported")
+    return value
+
+
+def _encodeArg(value: Any) -> Any:
+    if isinstance(value, IntEnum):
+        return {"$enum": type(value).__name__, "value": int(value)}
+    if isinstance(value, PurePath):
+        return {"$path": str(value)}
+    return value
+
+
+def _decodeArg(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$enum" in value:
+            enum = ENUMS.get(value["$enum"])
+            return enum(value["value"]) if enum is not None else value["value"]
+        if "$path" in value:
+            return value["$path"]
+    return value
+
+
+def _encodeStep(step: Step) -> Any:
+    if isinstance(step, str):
+        return step
+    return [step[0], [_encodeArg(arg) for arg in step[1]]]
+
+
+def _decodeStep(step: Any) -> Step:
+    if isinstance(step, str):
+        return step
+    return (step[0], tuple(_decodeArg(arg) for arg in step[1]))
+
+
+class _Resolver:
+    def __init__(self, root: Any) -> None:
+        self.root = root
+        self._cache: dict[Path, Any] = {(): root}
+
+    def invalidate(self) -> None:
+        self._cache = {(): self.root}
+
+    def resolve(self, path: Path) -> Any:
+        # Wrapper objects are kept for the whole connection, so a RemoteObject
+        # always refers to the object it was created for.
+        value = self._cache.get(path)
+        if value is None:
+            value = self.evaluate(path)
+        return value
+
+    def evaluate(self, path: Path) -> Any:
+        if not path:
+            return self.root
+        parent = _remoteObject(self.resolve(path[:-1]))
+        exports = _exports(type(parent))
+        step = path[-1]
+        if isinstance(step, str):
+            if step not in exports.attributes:
+                raise AttributeError(f"'{step}' is not exported")
+            value = getattr(parent, step)
+        else:
+            name, args = step
+            if name not in exports.methods:
+                raise AttributeError(f"Method '{name}' is not exported")
+            value = getattr(parent, name)(*args)
+        if isinstance(value, ComObject):
+            self._cache[path] = value
+        return value
+
+
+class RemoteServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self, root: ComObject, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ) -> None:
+        self.root = _remoteObject(root)
+        self._clients: set["_ClientHandler"] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        super().__init__((host, port), _ClientHandler)
+        if not _isLoopback(host):
+            LOG.warning(
+                "Remote server on %s accepts unauthenticated clients from the network",
+                host,
+            )
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def encode(self, value: Any, path: Path) -> Any:
+        if value is None or isinstance(value, (bool, str, float)):
+            return value
+        if isinstance(value, IntEnum):
+            return {"$enum": type(value).__name__, "value": int(value)}
+        if isinstance(value, int):
+            return value
+        if value is NotImplemented:
+            return {"$notimplemented": True}
+        if isinstance(value, PurePath):
+            return {"$path": str(value)}
+        if isinstance(value, (list, tuple)):
+            return [self.encode(item, path) for item in value]
+        if inspect.isroutine(value):
+            raise TypeError(f"{path[-1]!r} is a method and has to be called")
+        return {
+            "$object": type(_remoteObject(value)).__name__,
+            "path": [_encodeStep(step) for step in path],
+            "methods": sorted(_exports(type(value)).methods),
+        }
+
+    def execute(self, request: dict[str, Any], resolver: _Resolver) -> dict[str, Any]:
+        try:
+            path = tuple(_decodeStep(step) for step in request.get("path", []))
+            match request["op"]:
+                case "get":
+                    # The requested step itself is read again, only its
+                    # parents come from the cache.
+                    return {"result": self.encode(resolver.evaluate(path), path)}
+                case "set":
+                    target = _remoteObject(resolver.resolve(path[:-1]))
+                    name = path[-1]
+                    if not isinstance(name, str):
+                        raise AttributeError(f"Cannot assign to {name!r}")
+                    if name not in _exports(type(target)).writable:
+                        raise AttributeError(f"'{name}' is not writable")
+                    value = _decodeArg(request["value"])
+                    current = getattr(target, name, None)
+                    if isinstance(current, IntEnum):
+                        value = type(current)(value)
+                    setattr(target, name, value)
+                    return {"result": None}
+                case op:
+                    raise ValueError(f"Unknown operation '{op}'")
+        except Exception as exc:
+            return {"error": {"type": type(exc).__name__, "message": str(exc)}}
+
+    def dispatch(self, request: dict[str, Any], resolver: _Resolver) -> dict[str, Any]:
+        if request.get("op") == "batch":
+            results = [self.execute(item, resolver) for item in request["requests"]]
+            return {"id": request.get("id"), "result": results}
+        response = self.execute(request, resolver)
+        response["id"] = request.get("id")
+        return response
+
+    def notify(self, event: str, *args: Any) -> None:
+        message = {"event": event, "args": [self.encode(arg, ()) for arg in args]}
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            if client.wants(event):
+                client.send(message)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.resolver.invalidate()
+
+    def start(self) -> "RemoteServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="VectorCOM-remote", daemon=True
+        )
+        self._thread.start()
+        LOG.debug("Remote server listening on %s:%d", *self.server_address[:2])
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "RemoteServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class _ClientHandler(socketserver.StreamRequestHandler):
+    server: RemoteServer
+
+    def setup(self) -> None:
+        super().setup()
+        self._writeLock = threading.Lock()
+        self._subscriptions: set[str] = set()
+        self.resolver = _Resolver(self.server.root)
+        with self.server._lock:
+            self.server._clients.add(self)
+
+    def finish(self) -> None:
+        with self.server._lock:
+            self.server._clients.discard(self)
+        super().finish()
+
+    def wants(self, event: str) -> bool:
+        return "*" in self._subscriptions or event in self._subscriptions
+
+    def send(self, message: dict[str, Any]) -> None:
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        try:
+            with self._writeLock:
+                self.wfile.write(data)
+                self.wfile.flush()
+        except OSError:
+            LOG.debug("Dropping message for disconnected remote client")
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as exc:
+                error = {"type": "ValueError", "message": str(exc)}
+                self.send({"id": None, "error": error})
+                continue
+            match request.get("op"):
+                case "subscribe":
+                    self._subscriptions.update(request.get("events", ["*"]))
+                    self.send({"id": request.get("id"), "result": None})
+                case "unsubscribe":
+                    events = request.get("events", ["*"])
+                    self._subscriptions.difference_update(events)
+                    self.send({"id": request.get("id"), "result": None})
+                case _:
+                    self.send(self.server.dispatch(request, self.resolver))
+
+
+def _isLoopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def hookCanoeEvents(server: RemoteServer, canoe: Any) -> None:
+    def forward(owner: Any, name: str, invalidate: bool = False) -> None:
+        previous = getattr(owner, name)
+
+        def callback(*args: Any) -> None:
+            previous(*args)
+            # Objects cached from the old configuration are gone after a switch.
+            if invalidate:
+                server.invalidate()
+            server.notify(f"{type(owner).__name__}.{name}", *args)
+
+        setattr(owner, name, callback)
+
+    for name in ("OnOpen", "OnQuit"):
+        forward(canoe, name, invalidate=True)
+    configuration = canoe.Configuration
+    forward(configuration, "OnClose", invalidate=True)
+    forward(configuration, "OnSystemVariablesDefinitionChanged")
+    measurement = canoe.Measurement
+    for name in ("OnInit", "OnStart", "OnStop", "OnExit"):
+        forward(measurement, name)
+
+
+def _decodeValue(client: "RemoteClient", value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decodeValue(client, item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "$enum" in value:
+        enum = ENUMS.get(value["$enum"])
+        return enum(value["value"]) if enum is not None else value["value"]
+    if "$path" in value:
+        return PurePath(value["$path"])
+    if "$notimplemented" in value:
+        return NotImplemented
+    if "$object" in value:
+        path = tuple(_decodeStep(step) for step in value["path"])
+        client._methods.setdefault(value["$object"], frozenset(value["methods"]))
+        return RemoteObject(client, path, value["$object"])
+    return value
+
+
+def _unwrapResponse(client: "RemoteClient", response: dict[str, Any]) -> Any:
+    if "error" in response:
+        raise RemoteError(response["error"]["type"], response["error"]["message"])
+    return _decodeValue(client, response["result"])
+
+
+class RemoteMethod:
+    def __init__(self, target: "RemoteObject", name: str) -> None:
+        self._target = target
+        self._name = name
+
+    def submit(self, *args: Any) -> Future:
+        target = self._target
+        return target._client.getAsync(target._path + ((self._name, args),))
+
+    def __call__(self, *args: Any) -> Any:
+        return self.submit(*args).result(self._target._client.timeout)
+
+
+class RemoteObject:
+    __slots__ = ("_client", "_path", "_type")
+
+    def __init__(self, client: "RemoteClient", path: Path, typeName: str) -> None:
+        object.__setattr__(self, "_client", client)
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_type", typeName)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._client._methods.get(self._type, ()):
+            return RemoteMethod(self, name)
+        return self._client.get(self._path + (name,))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._client.set(self._path + (name,), value)
+
+    def getAsync(self, name: str) -> Future:
+        return self._client.getAsync(self._path + (name,))
+
+    def read(self, *names: str) -> dict[str, Any]:
+        values = self._client.getMany([self._path + (name,) for name in names])
+        return dict(zip(names, values))
+
+    def __iter__(self) -> Iterator[Any]:
+        count = self.Count
+        futures = [
+            self._client.getAsync(self._path + (("Item", (index,)),))
+            for index in range(1, count + 1)
+        ]
+        for future in futures:
+            yield future.result(self._client.timeout)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._client.get(self._path + (("Item", (index,)),))
+
+    def __repr__(self) -> str:
+        return f"<Remote {self._type} at {self._path!r}>"
+
+
+class RemoteClient:
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: Optional[float] = 30.0,
+        onError: Optional[Callable[[RemoteError], None]] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.onError = onError
+        self._sock = socket.create_connection((host, port))
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._rfile = self._sock.makefile("rb")
+        self._writeLock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: dict[int, tuple[Future, bool]] = {}
+        self._pendingLock = threading.Lock()
+        self._closed = False
+        self._handlers: dict[str, list[Callable[..., None]]] = {}
+        self._methods: dict[str, frozenset[str]] = {}
+        self._root: Optional[RemoteObject] = None
+        # Handlers run off the reader thread, so they can make requests of
+        # their own without waiting on the thread that reads the replies.
+        self._events = CallbackExecutor(name="VectorCOM-remote-events")
+        self._reader = threading.Thread(
+            target=self._read, name="VectorCOM-remote-client", daemon=True
+        )
+        self._reader.start()
+
+    @property
+    def root(self) -> RemoteObject:
+        if self._root is None:
+            self._root = self.get(())
+        return self._root
+
+    @property
+    def connected(self) -> bool:
+        return not self._closed
+
+    def _send(self, message: dict[str, Any], raw: bool = False) -> Future:
+        future: Future = Future()
+        message["id"] = next(self._ids)
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with self._pendingLock:
+            if self._closed:
+                raise ConnectionError("Remote server disconnected")
+            self._pending[message["id"]] = (future, raw)
+        try:
+            with self._writeLock:
+                self._sock.sendall(data)
+        except OSError:
+            with self._pendingLock:
+                self._pending.pop(message["id"], None)
+            raise
+        return future
+
+    def _error(self, message: dict[str, Any]) -> None:
+        error = message.get("error") or {}
+        exc = RemoteError(
+            error.get("type", "Error"), error.get("message", repr(message))
+        )
+        if self.onError is None:
+            LOG.error("Remote server reported %s", exc)
+            return
+        try:
+            self.onError(exc)
+        except Exception:
+            LOG.exception("Remote error handler %r raised", self.onError)
+
+    def _read(self) -> None:
+        try:
+            for line in self._rfile:
+                message = json.loads(line)
+                if "event" in message:
+                    self._events.submit(self._dispatchEvent, message)
+                    continue
+                # Errors the server cannot tie to a request, e.g. a line it
+                # could not parse, come back without an id.
+                with self._pendingLock:
+                    pending = self._pending.pop(message.get("id"), None)
+                if pending is None:
+                    self._error(message)
+                    continue
+                future, raw = pending
+                if raw:
+                    future.set_result(message)
+                    continue
+                try:
+                    future.set_result(_unwrapResponse(self, message))
+                except Exception as exc:
+                    future.set_exception(exc)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._pendingLock:
+                self._closed = True
+                stranded = list(self._pending.values())
+                self._pending.clear()
+            for future, _ in stranded:
+                future.set_exception(ConnectionError("Remote server disconnected"))
+
+    def _dispatchEvent(self, message: dict[str, Any]) -> None:
+        args = [_decodeValue(self, arg) for arg in message["args"]]
+        for handler in list(self._handlers.get(message["event"], [])):
+            try:
+                handler(*args)
+            except Exception:
+                LOG.exception("Remote event handler %r raised", handler)
+
+    def getAsync(self, path: Sequence[Step]) -> Future:
+        return self._send({"op": "get", "path": [_encodeStep(step) for step in path]})
+
+    def get(self, path: Sequence[Step]) -> Any:
+        return self.getAsync(path).result(self.timeout)
+
+    def set(self, path: Sequence[Step], value: Any) -> None:
+        self._send(
+            {
+                "op": "set",
+                "path": [_encodeStep(step) for step in path],
+                "value": _encodeArg(value),
+            }
+        ).result(self.timeout)
+
+    def getManyAsync(self, paths: Iterable[Sequence[Step]]) -> Future:
+        requests = [
+            {"op": "get", "path": [_encodeStep(step) for step in path]}
+            for path in paths
+        ]
+        outer = self._send({"op": "batch", "requests": requests}, raw=True)
+        result: Future = Future()
+
+        def unpack(done: Future) -> None:
+            try:
+                responses = done.result()["result"]
+                result.set_result(
+                    [
+                        RemoteError(r["error"]["type"], r["error"]["message"])
+                        if "error" in r
+                        else _decodeValue(self, r["result"])
+                        for r in responses
+                    ]
+                )
+            except Exception as exc:
+                result.set_exception(exc)
+
+        outer.add_done_callback(unpack)
+        return result
+
+    def getMany(self, paths: Iterable[Sequence[Step]]) -> list[Any]:
+        return self.getManyAsync(paths).result(self.timeout)
+
+    def subscribe(self, event: str, handler: Callable[..., None]) -> None:
+        if event not in self._handlers:
+            self._send({"op": "subscribe", "events": [event]}).result(self.timeout)
+        self._handlers.setdefault(event, []).append(handler)
+
+    def waitEvent(self, event: str, timeout: float = 0) -> tuple:
+        fired = common.RefBool(False)
+        received: list[tuple] = []
+
+        def handler(*args: Any) -> None:
+            received.append(args)
+            fired.true
+
+        self.subscribe(event, handler)
+        try:
+            common.waitEventFinished(fired, timeout, 0.01)
+        finally:
+            self._handlers[event].remove(handler)
+        return received[0]
+
+    def close(self) -> None:
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._reader.join()
+        self._events.shutdown()
+
+    def __enter__(self) -> "RemoteClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,228 @@
+import logging
+from time import perf_counter, sleep
+from typing import Callable, Iterable, Optional
+
+import pythoncom
+
+from .apartment import ComProxy
+from .common import LatencyStats, waitEventFinished
+from .configuration import CfgMode, Configuration
+from .measurement import Measurement
+
+LOG = logging.getLogger("VectorCOM")
+
+Clock = Callable[[], float]
+
+
+class ReplayProgress:
+    def __init__(self, steps: int, elapsed: float, timestamp: Optional[float]) -> None:
+        self.steps = steps
+        self.elapsed = elapsed
+        self.timestamp = timestamp
+
+    @property
+    def stepRate(self) -> float:
+        return self.steps / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ReplayProgress(steps={self.steps}, elapsed={self.elapsed:.1f}s, "
+            f"timestamp={self.timestamp}, stepRate={self.stepRate:.0f}/s)"
+        )
+
+
+class ReplayReport:
+    def __init__(self) -> None:
+        self.steps = 0
+        self.wallTime = 0.0
+        self.startTimestamp: Optional[float] = None
+        self.endTimestamp: Optional[float] = None
+        self.breakpointsHit: list[float] = []
+        self.completed = False
+        self.batchTime = LatencyStats()
+
+    @property
+    def replayedTime(self) -> Optional[float]:
+        if self.startTimestamp is None or self.endTimestamp is None:
+            return None
+        return self.endTimestamp - self.startTimestamp
+
+    @property
+    def speed(self) -> Optional[float]:
+        replayed = self.replayedTime
+        if replayed is None or self.wallTime <= 0:
+            return None
+        return replayed / self.wallTime
+
+    @property
+    def stepsPerSecond(self) -> float:
+        return self.steps / self.wallTime if self.wallTime > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ReplayReport(completed={self.completed}, steps={self.steps}, "
+            f"wallTime={self.wallTime:.2f}s, replayedTime={self.replayedTime}, "
+            f"speed={self.speed}, stepsPerSecond={self.stepsPerSecond:.0f}, "
+            f"breakpointsHit={self.breakpointsHit})"
+        )
+
+
+class ReplayRunner:
+    def __init__(
+        self,
+        measurement: Measurement,
+        clock: Optional[Clock] = None,
+        batchSize: int = 200,
+        onProgress: Optional[Callable[[ReplayProgress], None]] = None,
+        progressInterval: float = 1.0,
+        onBreakpoint: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.measurement = measurement
+        self.clock = clock
+        self.batchSize = batchSize
+        self.onProgress = onProgress
+        self.progressInterval = progressInterval
+        self.onBreakpoint = onBreakpoint
+        self._lastProgress = 0.0
+
+    @classmethod
+    def forConfiguration(
+        cls, configuration: Configuration, measurement: Measurement, **kwargs
+    ) -> "ReplayRunner":
+        if configuration.Mode != CfgMode.Offline:
+            raise RuntimeError("Replay needs the configuration in offline mode")
+        return cls(measurement, **kwargs)
+
+    @property
+    def _stopped(self) -> bool:
+        return bool(self.measurement.events.OnStopFinished)
+
+    def _step(self, count: int) -> int:
+        com = self.measurement._com
+        target = com._target if isinstance(com, ComProxy) else com
+
+        def steps() -> int:
+            done = 0
+            # The stop event can arrive while stepping; another Step would
+            # start the replay over.
+            while done < count and not self._stopped:
+                target.Step()
+                done += 1
+            return done
+
+        # One apartment round trip per batch instead of one per step.
+        if isinstance(com, ComProxy):
+            return com.apartment.call(steps)
+        done = steps()
+        pythoncom.PumpWaitingMessages()
+        return done
+
+    def _report(self, report: ReplayReport, start: float, force: bool = False) -> None:
+        if self.onProgress is None:
+            return
+        now = perf_counter()
+        if not force and now - self._lastProgress < self.progressInterval:
+            return
+        self._lastProgress = now
+        timestamp = self.clock() if self.clock is not None else None
+        self.onProgress(ReplayProgress(report.steps, now - start, timestamp))
+
+    def run(
+        self,
+        speed: Optional[float] = None,
+        breakpoints: Iterable[float] = (),
+        timeout: float = 0,
+        reset: bool = True,
+    ) -> ReplayReport:
+        breakpoints = sorted(breakpoints)
+        if (speed is not None or breakpoints) and self.clock is None:
+            raise ValueError("Speed factors and breakpoints need a clock")
+        if reset:
+            self.measurement.Reset()
+        report = ReplayReport()
+        self.measurement.events.OnStopFinished.false
+        start = self._lastProgress = perf_counter()
+        if self.clock is not None:
+            report.startTimestamp = self.clock()
+        if speed is None and not breakpoints:
+            self._runFree(report, start, timeout)
+        else:
+            self._runStepped(report, start, timeout, speed, breakpoints)
+        report.wallTime = perf_counter() - start
+        if self.clock is not None:
+            report.endTimestamp = self.clock()
+        self._report(report, start, force=True)
+        LOG.info("%r", report)
+        return report
+
+    def animate(self, delay: int, timeout: float = 0) -> ReplayReport:
+        self.measurement.AnimationDelay = delay
+        report = ReplayReport()
+        self.measurement.events.OnStopFinished.false
+        start = self._lastProgress = perf_counter()
+        self.measurement.Animate()
+        waitEventFinished(
+            self.measurement.events.OnStopFinished,
+            timeout,
+            onWait=lambda: self._report(report, start),
+        )
+        report.completed = True
+        report.wallTime = perf_counter() - start
+        return report
+
+    def pause(self) -> None:
+        self.measurement.Break()
+
+    def _runFree(self, report: ReplayReport, start: float, timeout: float) -> None:
+        # Offline Start replays as fast as possible; the stop event marks the end.
+        self.measurement.Start()
+        waitEventFinished(
+            self.measurement.events.OnStopFinished,
+            timeout,
+            onWait=lambda: self._report(report, start),
+        )
+        report.completed = True
+
+    def _runStepped(
+        self,
+        report: ReplayReport,
+        start: float,
+        timeout: float,
+        speed: Optional[float],
+        breakpoints: list[float],
+    ) -> None:
+        assert self.clock is not None and report.startTimestamp is not None
+        origin = report.startTimestamp
+        rate: Optional[float] = None  # replayed seconds per step
+        probe = 1
+        timestamp = origin
+        while not self._stopped:
+            if timeout and perf_counter() - start > timeout:
+                raise TimeoutError("Replay did not finish in time")
+            count = self.batchSize
+            if breakpoints and rate:
+                # Shrink the batch near a breakpoint so it is not overshot.
+                count = max(1, min(count, int((breakpoints[0] - timestamp) / rate)))
+            elif breakpoints:
+                # No rate yet: probe with a single step, doubling while the clock
+                # does not move, so a close first breakpoint is not overshot.
+                count, probe = min(count, probe), probe * 2
+            batch_start = perf_counter()
+            done = self._step(count)
+            report.batchTime.record(perf_counter() - batch_start)
+            report.steps += done
+            previous, timestamp = timestamp, self.clock()
+            if done and timestamp > previous:
+                rate = (timestamp - previous) / done
+            while breakpoints and timestamp >= breakpoints[0]:
+                hit = breakpoints.pop(0)
+                report.breakpointsHit.append(timestamp)
+                LOG.debug("Replay breakpoint %.3f reached at %.3f", hit, timestamp)
+                if self.onBreakpoint is not None:
+                    self.onBreakpoint(timestamp)
+            if speed is not None:
+                ahead = (timestamp - origin) / speed - (perf_counter() - start)
+                if ahead > 0:
+                    sleep(ahead)
+            self._report(report, start)
+        report.completed = True
@@ -0,0 +1,195 @@
+import array
+import csv
+import logging
+import threading
+from pathlib import Path as PLPath
+from time import perf_counter
+from typing import Any, Callable, Mapping, Optional, Sequence, Union
+
+from .apartment import ComApartment
+from .common import LatencyStats
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, array buffers work without it
+    numpy = None
+
+LOG = logging.getLogger("VectorCOM")
+
+
+class RingBuffer:
+    def __init__(self, capacity: int, typecode: str = "d") -> None:
+        self.capacity = capacity
+        self.typecode = typecode
+        if numpy is not None:
+            self._data: Any = numpy.zeros(capacity, dtype=typecode)
+        else:
+            self._data = array.array(typecode, [0]) * capacity
+        self._view = memoryview(self._data)
+        self.written = 0
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def append(self, value: float) -> None:
+        self._data[self.written % self.capacity] = value
+        self.written += 1
+
+    def segments(self, written: Optional[int] = None) -> tuple[Any, ...]:
+        if written is None:
+            written = self.written
+        data = self._data if numpy is not None else self._view
+        end = written % self.capacity
+        if written <= self.capacity:
+            return (data[:written],)
+        # Oldest samples first: [end:] wrapped around to [:end]. Both are views,
+        # valid until the writer laps them.
+        return (data[end:], data[:end])
+
+    def values(self, written: Optional[int] = None) -> Any:
+        segments = self.segments(written)
+        if numpy is not None:
+            return numpy.concatenate(segments)
+        result = array.array(self.typecode)
+        for segment in segments:
+            result.frombytes(segment.cast("B"))
+        return result
+
+
+class SamplerStats:
+    def __init__(self) -> None:
+        self.samples = 0
+        self.missed = 0
+        self.readTime = LatencyStats()
+        self.lateness = LatencyStats()
+
+    def __repr__(self) -> str:
+        return (
+            f"SamplerStats(samples={self.samples}, missed={self.missed}, "
+            f"readTime={self.readTime!r}, lateness={self.lateness!r})"
+        )
+
+
+class Snapshot:
+    def __init__(self, times: tuple[Any, ...], channels: dict[str, tuple]) -> None:
+        self.times = times
+        self.channels = channels
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.times)
+
+
+class SignalSampler:
+    def __init__(
+        self,
+        signals: Mapping[str, Callable[[], float]],
+        apartment: ComApartment,
+        period: float = 0.005,
+        capacity: int = 100_000,
+    ) -> None:
+        # The readers touch COM objects, which must only be used from the
+        # apartment they belong to, never from the sampler thread.
+        if not isinstance(apartment, ComApartment):
+            raise TypeError("SignalSampler needs the ComApartment the signals live in")
+        self.signals = dict(signals)
+        self.period = period
+        self.apartment = apartment
+        self.stats = SamplerStats()
+        self.times = RingBuffer(capacity)
+        self.buffers = {name: RingBuffer(capacity) for name in self.signals}
+        self._readers = list(self.signals.values())
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def _read(self) -> Sequence[float]:
+        return self.apartment.batch(self._readers).result()
+
+    def _run(self) -> None:
+        stats = self.stats
+        channels = list(self.buffers.values())
+        tick = 0
+        while not self._stop.is_set():
+            deadline = self._start + tick * self.period
+            delay = deadline - perf_counter()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            now = perf_counter()
+            stats.lateness.record(max(now - deadline, 0.0))
+            try:
+                values = self._read()
+            except Exception:
+                LOG.exception("Signal sampling failed, stopping sampler")
+                break
+            stats.readTime.record(perf_counter() - now)
+            for buffer, value in zip(channels, values):
+                buffer.append(value)
+            # Timestamps go last: their count marks a sample as complete.
+            self.times.append(now - self._start)
+            stats.samples += 1
+            # Schedule against the start time so read latency does not
+            # accumulate; deadlines already passed are counted and skipped.
+            next_tick = int((perf_counter() - self._start) / self.period) + 1
+            stats.missed += max(next_tick - tick - 1, 0)
+            tick = max(next_tick, tick + 1)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Sampler is already running")
+        self._stop.clear()
+        self._start = perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="VectorCOM-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> SamplerStats:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        LOG.debug("%r", self.stats)
+        return self.stats
+
+    def __enter__(self) -> "SignalSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def sampleDuring(self, testcfg: Any, timeout: float = 0) -> SamplerStats:
+        self.start()
+        try:
+            testcfg.Start()
+            testcfg.waitFinished(timeout)
+        finally:
+            self.stop()
+        return self.stats
+
+    def snapshot(self) -> Snapshot:
+        # Every channel is cut at the same sample count as the timestamps.
+        written = self.times.written
+        return Snapshot(
+            self.times.segments(written),
+            {name: buffer.segments(written) for name, buffer in self.buffers.items()},
+        )
+
+    def arrays(self) -> dict[str, Any]:
+        written = self.times.written
+        result = {"time": self.times.values(written)}
+        for name, buffer in self.buffers.items():
+            result[name] = buffer.values(written)
+        return result
+
+    def saveNpz(self, path: Union[str, PLPath]) -> None:
+        if numpy is None:
+            raise ImportError("NPZ export requires the 'numpy' package")
+        numpy.savez(path, **self.arrays())
+
+    def saveCsv(self, path: Union[str, PLPath]) -> None:
+        columns = self.arrays()
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows(zip(*columns.values()))
@@ -0,0 +1,214 @@
+import heapq
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence
+
+from .common import Verdict
+
+LOG = logging.getLogger("VectorCOM")
+
+_SEVERITY = {
+    Verdict.VerdictNotAvailable: 0,
+    Verdict.VerdictNone: 1,
+    Verdict.VerdictPassed: 2,
+    Verdict.VerdictInconclusive: 3,
+    Verdict.VerdictFailed: 4,
+    Verdict.VerdictErrorInTestSystem: 5,
+}
+
+
+def worstVerdict(verdicts: Iterable[Verdict]) -> Verdict:
+    return max(verdicts, key=_SEVERITY.__getitem__, default=Verdict.VerdictNotAvailable)
+
+
+class ResultNode:
+    def __init__(self, elementId: Optional[str], title: str) -> None:
+        self.elementId = elementId
+        self.title = title
+        self.verdict = Verdict.VerdictNotAvailable
+        self.shard: Optional[int] = None
+        self.children: list[ResultNode] = []
+
+    def leaves(self) -> Iterator["ResultNode"]:
+        if not self.children:
+            yield self
+        for child in self.children:
+            yield from child.leaves()
+
+    def __repr__(self) -> str:
+        return (
+            f"ResultNode({self.title!r}, verdict={self.verdict.name}, "
+            f"children={len(self.children)})"
+        )
+
+
+class Shard:
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.cases: list[str] = []
+        self.estimated = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"Shard({self.index}, cases={len(self.cases)}, "
+            f"estimated={self.estimated:.1f}s)"
+        )
+
+
+def _leafElements(elements: Any, parent: Optional[ResultNode] = None) -> Iterator[Any]:
+    # The one definition of a test case, shared by the plan and applyShard: an
+    # element without children that has an Id. With a parent, the enabled part
+    # of the tree is built along the way.
+    for element in elements:
+        children = element.Elements
+        enabled = parent is not None and element.Enabled
+        if children.Count:
+            node = ResultNode(element.Id, element.Title) if enabled else None
+            yield from _leafElements(children, node)
+            if parent is not None and node is not None and node.children:
+                parent.children.append(node)
+            continue
+        element_id = element.Id
+        if not element_id:
+            if parent is not None:
+                LOG.warning("Test case '%s' has no Id, not sharded", element.Title)
+            continue
+        if parent is not None and enabled:
+            parent.children.append(ResultNode(element_id, element.Title))
+        yield element
+
+
+def testTree(testcfg: Any) -> ResultNode:
+    root = ResultNode(testcfg.Id, testcfg.Name)
+    for unit in testcfg.TestUnits:
+        if not unit.Enabled or unit.Elements is None:
+            continue
+        node = ResultNode(unit.Id, unit.Name)
+        for _ in _leafElements(unit.Elements, node):
+            pass
+        if node.children:
+            root.children.append(node)
+    return root
+
+
+def elementDurations(
+    durations: Mapping[tuple[str, str, str], float], configuration: str, testcfg: str
+) -> dict[str, float]:
+    # ResultHistory.meanDurations() keys by (configuration, testcfg, element),
+    # the plan by element Id within one test configuration.
+    return {
+        element: duration
+        for (cfg, tc, element), duration in durations.items()
+        if cfg == configuration and tc == testcfg
+    }
+
+
+def planShards(
+    cases: Sequence[str], durations: Mapping[str, float], count: int
+) -> list[Shard]:
+    known = [durations[case] for case in cases if case in durations]
+    if durations and not known:
+        LOG.warning(
+            "None of the %d cases has a known duration, shards are split by count",
+            len(cases),
+        )
+    default = median(known) if known else 1.0
+    shards = [Shard(index) for index in range(count)]
+    heap = [(0.0, index) for index in range(count)]
+    # Longest processing time first: the biggest remaining case goes to the
+    # currently lightest shard.
+    ordered = sorted(cases, key=lambda case: durations.get(case, default), reverse=True)
+    for case in ordered:
+        load, index = heapq.heappop(heap)
+        shards[index].cases.append(case)
+        load += durations.get(case, default)
+        shards[index].estimated = load
+        heapq.heappush(heap, (load, index))
+    return shards
+
+
+def _findTestConfiguration(canoe: Any, name: str) -> Any:
+    for testcfg in canoe.Configuration.TestConfigurations:
+        if testcfg.Name == name:
+            return testcfg
+    raise KeyError(f"No test configuration named '{name}'")
+
+
+def applyShard(
+    testcfg: Any, cases: Iterable[str] | Mapping[str, bool]
+) -> dict[str, bool]:
+    wanted = cases if isinstance(cases, Mapping) else dict.fromkeys(cases, True)
+    previous: dict[str, bool] = {}
+    for unit in testcfg.TestUnits:
+        if unit.Elements is None:
+            continue
+        for element in _leafElements(unit.Elements):
+            element_id = element.Id
+            enabled = element.Enabled
+            previous[element_id] = enabled
+            if wanted.get(element_id, False) != enabled:
+                element.Enabled = wanted.get(element_id, False)
+    return previous
+
+
+def _runShard(
+    canoe: Any, name: str, shard: Shard, timeout: float
+) -> dict[str, Verdict]:
+    testcfg = _findTestConfiguration(canoe, name)
+    cases = set(shard.cases)
+    previous = applyShard(testcfg, cases)
+    try:
+        canoe.Measurement.Start()
+        testcfg.Start()
+        testcfg.waitFinished(timeout)
+        verdicts: dict[str, Verdict] = {}
+        for unit in testcfg.TestUnits:
+            if unit.Elements is None:
+                continue
+            for element in _leafElements(unit.Elements):
+                if element.Id in cases:
+                    verdicts[element.Id] = Verdict(element.Verdict)
+        LOG.debug("Shard %d finished with %d verdicts", shard.index, len(verdicts))
+        return verdicts
+    finally:
+        applyShard(testcfg, previous)
+
+
+def mergeResults(
+    tree: ResultNode, results: Sequence[Mapping[str, Verdict]]
+) -> ResultNode:
+    verdicts = {
+        case: (shard, verdict)
+        for shard, result in enumerate(results)
+        for case, verdict in result.items()
+    }
+
+    def merge(node: ResultNode) -> Verdict:
+        if node.children:
+            node.verdict = worstVerdict(merge(child) for child in node.children)
+        elif node.elementId in verdicts:
+            node.shard, node.verdict = verdicts[node.elementId]
+        return node.verdict
+
+    merge(tree)
+    return tree
+
+
+def runSharded(
+    canoes: Sequence[Any],
+    testcfgName: str,
+    durations: Mapping[str, float],
+    timeout: float = 0,
+) -> tuple[ResultNode, list[Shard]]:
+    tree = testTree(_findTestConfiguration(canoes[0], testcfgName))
+    cases = [leaf.elementId for leaf in tree.leaves() if leaf.elementId]
+    shards = planShards(cases, durations, len(canoes))
+    LOG.info("Running %s in shards %r", testcfgName, shards)
+    with ThreadPoolExecutor(len(canoes), thread_name_prefix="VectorCOM-shard") as pool:
+        futures = [
+            pool.submit(_runShard, canoe, testcfgName, shard, timeout)
+            for canoe, shard in zip(canoes, shards)
+        ]
+        results = [future.result() for future in futures]
+    return mergeResults(tree, results), shards
@@ -0,0 +1,140 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Optional
+
+from .apartment import ComApartment
+from .canoe import Canoe
+from .configuration import PLPath
+
+LOG = logging.getLogger("VectorCOM")
+
+
+def _newInstance(attach: bool) -> Canoe:
+    apartment = ComApartment()
+    try:
+        return Canoe(apartment, newInstance=not attach, attach=attach)
+    except BaseException:
+        apartment.shutdown(wait=False)
+        raise
+
+
+class InstanceStats:
+    def __init__(self, attached: bool) -> None:
+        self.attached = attached
+        self.configuration: Optional[PLPath] = None
+        self.launchTime = 0.0
+        self.openTime = 0.0
+        self.idleTime = 0.0
+        self._readyAt: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"InstanceStats(configuration={self.configuration!r}, "
+            f"attached={self.attached}, launchTime={self.launchTime:.3f}, "
+            f"openTime={self.openTime:.3f}, idleTime={self.idleTime:.3f})"
+        )
+
+
+class _Standby:
+    def __init__(self, canoe: Canoe, stats: InstanceStats) -> None:
+        self.canoe = canoe
+        self.stats = stats
+
+
+class StandbyManager:
+    def __init__(
+        self,
+        factory: Callable[[bool], Canoe] = _newInstance,
+        attachFirst: bool = False,
+        quitReleased: bool = True,
+    ) -> None:
+        self.factory = factory
+        self.quitReleased = quitReleased
+        self.stats: list[InstanceStats] = []
+        self._attach = attachFirst
+        self._pool = ThreadPoolExecutor(2, thread_name_prefix="VectorCOM-standby")
+        self._standby: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def _prepare(self, path: Optional[PLPath], attach: bool) -> _Standby:
+        stats = InstanceStats(attach)
+        start = perf_counter()
+        canoe = self.factory(attach)
+        stats.launchTime = perf_counter() - start
+        if path is not None:
+            try:
+                self._open(canoe, stats, path)
+            except BaseException:
+                # Nobody gets this instance, so it is not left running.
+                self._shutdown(canoe)
+                raise
+        stats._readyAt = perf_counter()
+        LOG.debug("Standby CANoe ready: %r", stats)
+        return _Standby(canoe, stats)
+
+    @staticmethod
+    def _open(canoe: Canoe, stats: InstanceStats, path: PLPath) -> None:
+        start = perf_counter()
+        canoe.Open(path)
+        stats.openTime += perf_counter() - start
+        stats.configuration = path
+
+    def prepare(self, path: Optional[PLPath] = None) -> Future:
+        with self._lock:
+            if self._standby is not None:
+                raise RuntimeError("A standby instance is already being prepared")
+            attach, self._attach = self._attach, False
+            self._standby = self._pool.submit(self._prepare, path, attach)
+            return self._standby
+
+    def acquire(
+        self, path: Optional[PLPath] = None, timeout: Optional[float] = None
+    ) -> Canoe:
+        with self._lock:
+            future, self._standby = self._standby, None
+            if future is None:
+                # Without a prepare() the first instance may still be attached.
+                attach, self._attach = self._attach, False
+                future = self._pool.submit(self._prepare, path, attach)
+        standby: _Standby = future.result(timeout)
+        stats = standby.stats
+        if path is not None and stats.configuration != path:
+            self._open(standby.canoe, stats, path)
+        if stats._readyAt is not None:
+            stats.idleTime = perf_counter() - stats._readyAt
+        self.stats.append(stats)
+        return standby.canoe
+
+    def _shutdown(self, canoe: Canoe) -> None:
+        try:
+            if self.quitReleased:
+                canoe.Quit()
+        finally:
+            if canoe.apartment is not None:
+                canoe.apartment.shutdown()
+
+    def release(self, canoe: Canoe) -> Future:
+        return self._pool.submit(self._shutdown, canoe)
+
+    def close(self) -> None:
+        with self._lock:
+            future, self._standby = self._standby, None
+        try:
+            if future is not None:
+                try:
+                    standby: _Standby = future.result()
+                except Exception:
+                    # _prepare already shut down whatever it had started.
+                    LOG.exception("Standby CANoe could not be prepared")
+                else:
+                    self.release(standby.canoe)
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self) -> "StandbyManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
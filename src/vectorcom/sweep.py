@@ -0,0 +1,200 @@
+import logging
+from time import perf_counter
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+from .canoe import Canoe
+from .common import LatencyStats, Verdict
+
+LOG = logging.getLogger("VectorCOM")
+
+
+class SweepJob(NamedTuple):
+    hardware: int
+    channelMapping: str
+    testConfiguration: str
+
+
+State = tuple[Optional[int], Optional[str]]
+
+# A restart after a hardware switch costs more than one after a mapping switch,
+# so every kind of transition gets its own timings.
+TRANSITIONS = ("hardware", "mapping", "combined")
+
+
+def transitionKind(hardwareChanged: bool, mappingChanged: bool) -> Optional[str]:
+    if hardwareChanged and mappingChanged:
+        return "combined"
+    if hardwareChanged:
+        return "hardware"
+    if mappingChanged:
+        return "mapping"
+    return None
+
+
+def countSwitches(
+    jobs: Sequence[SweepJob], start: State = (None, None)
+) -> tuple[int, int]:
+    hardware, mapping = start
+    hw_switches = map_switches = 0
+    for job in jobs:
+        if job.hardware != hardware:
+            hw_switches += 1
+            hardware = job.hardware
+        if job.channelMapping != mapping:
+            map_switches += 1
+            mapping = job.channelMapping
+    return hw_switches, map_switches
+
+
+def countTransitions(
+    jobs: Sequence[SweepJob], start: State = (None, None)
+) -> dict[str, int]:
+    counts = dict.fromkeys(TRANSITIONS, 0)
+    hardware, mapping = start
+    for job in jobs:
+        kind = transitionKind(job.hardware != hardware, job.channelMapping != mapping)
+        if kind is not None:
+            counts[kind] += 1
+        hardware, mapping = job.hardware, job.channelMapping
+    return counts
+
+
+def _groups(items: Iterable[SweepJob], key: str) -> dict:
+    groups: dict = {}
+    for item in items:
+        groups.setdefault(getattr(item, key), []).append(item)
+    return groups
+
+
+def planSweep(jobs: Iterable[SweepJob], start: State = (None, None)) -> list[SweepJob]:
+    by_hardware = _groups(jobs, "hardware")
+    hardware_order = list(by_hardware)
+    if start[0] in by_hardware:
+        hardware_order.remove(start[0])
+        hardware_order.insert(0, start[0])
+
+    ordered: list[SweepJob] = []
+    mapping = start[1]
+    for position, hardware in enumerate(hardware_order):
+        by_mapping = _groups(by_hardware[hardware], "channelMapping")
+        mappings = list(by_mapping)
+        # Keep the active mapping across the hardware switch, and end on a
+        # mapping the next hardware selection needs so it carries over too.
+        kept = mapping in by_mapping
+        if kept:
+            mappings.remove(mapping)
+            mappings.insert(0, mapping)
+        if position + 1 < len(hardware_order) and len(mappings) > 1:
+            upcoming = by_hardware[hardware_order[position + 1]]
+            following = {job.channelMapping for job in upcoming}
+            for candidate in reversed(mappings[int(kept) :]):
+                if candidate in following:
+                    mappings.remove(candidate)
+                    mappings.append(candidate)
+                    break
+        for name in mappings:
+            ordered.extend(by_mapping[name])
+        mapping = mappings[-1]
+    return ordered
+
+
+class SweepReport:
+    def __init__(self) -> None:
+        self.verdicts: list[tuple[SweepJob, Verdict]] = []
+        self.hardwareSwitches = 0
+        self.mappingSwitches = 0
+        self.naiveHardwareSwitches = 0
+        self.naiveMappingSwitches = 0
+        self.transitions = dict.fromkeys(TRANSITIONS, 0)
+        self.naiveTransitions = dict.fromkeys(TRANSITIONS, 0)
+        self.switchTime = {kind: LatencyStats() for kind in TRANSITIONS}
+
+    @property
+    def switchingTime(self) -> float:
+        return sum(stats.total for stats in self.switchTime.values())
+
+    def transitionCost(self, kind: str) -> float:
+        stats = self.switchTime[kind]
+        if stats.count:
+            return stats.mean
+        # Not measured in this run: a combined switch costs about both single
+        # ones, a single one at most a combined one.
+        if kind == "combined":
+            return self.switchTime["hardware"].mean + self.switchTime["mapping"].mean
+        return self.switchTime["combined"].mean
+
+    @property
+    def estimatedTimeSaved(self) -> float:
+        return sum(
+            (self.naiveTransitions[kind] - self.transitions[kind])
+            * self.transitionCost(kind)
+            for kind in TRANSITIONS
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"SweepReport(jobs={len(self.verdicts)}, "
+            f"hardwareSwitches={self.hardwareSwitches}/"
+            f"{self.naiveHardwareSwitches}, "
+            f"mappingSwitches={self.mappingSwitches}/{self.naiveMappingSwitches}, "
+            f"switchingTime={self.switchingTime:.1f}s, "
+            f"estimatedTimeSaved={self.estimatedTimeSaved:.1f}s)"
+        )
+
+
+class SweepRunner:
+    def __init__(self, canoe: Canoe) -> None:
+        self.canoe = canoe
+
+    def _apply(self, job: SweepJob, report: SweepReport) -> None:
+        configuration = self.canoe.Configuration
+        measurement = self.canoe.Measurement
+        hardware_changed = configuration.HwConfigurationSelection != job.hardware
+        mapping_changed = self.canoe.ChannelMappingName != job.channelMapping
+        if not hardware_changed and not mapping_changed:
+            measurement.Start()
+            return
+        start = perf_counter()
+        measurement.StopEx()
+        if hardware_changed:
+            configuration.HwConfigurationSelection = job.hardware
+            report.hardwareSwitches += 1
+        if mapping_changed:
+            self.canoe.ChannelMappingName = job.channelMapping
+            report.mappingSwitches += 1
+        measurement.Start()
+        elapsed = perf_counter() - start
+        kind = transitionKind(hardware_changed, mapping_changed)
+        assert kind is not None
+        report.transitions[kind] += 1
+        report.switchTime[kind].record(elapsed)
+        LOG.debug("Switched %s to %s in %.1fs", kind, job[:2], elapsed)
+
+    def _runTestConfiguration(self, name: str, timeout: float) -> Verdict:
+        for testcfg in self.canoe.Configuration.TestConfigurations:
+            if testcfg.Name == name:
+                testcfg.Start()
+                testcfg.waitFinished(timeout)
+                return testcfg.Verdict
+        raise KeyError(f"No test configuration named '{name}'")
+
+    def run(
+        self, jobs: Iterable[SweepJob], plan: bool = True, timeout: float = 0
+    ) -> SweepReport:
+        jobs = list(jobs)
+        start: State = (
+            self.canoe.Configuration.HwConfigurationSelection,
+            self.canoe.ChannelMappingName,
+        )
+        report = SweepReport()
+        report.naiveHardwareSwitches, report.naiveMappingSwitches = countSwitches(
+            jobs, start
+        )
+        report.naiveTransitions = countTransitions(jobs, start)
+        for job in planSweep(jobs, start) if plan else jobs:
+            self._apply(job, report)
+            report.verdicts.append(
+                (job, self._runTestConfiguration(job.testConfiguration, timeout))
+            )
+        LOG.info("%r", report)
+        return report
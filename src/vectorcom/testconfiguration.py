@@ -1,11 +1,22 @@
 import logging
 from types import NotImplementedType
-from typing import Callable, ClassVar, Optional
+from typing import Callable, Iterable, Optional, Sequence
 
 import rich.repr
-from win32com.client import CDispatch, WithEvents
-
-from .common import RefBool, StopReason, TestElementType, Verdict, waitEventFinished
+from win32com.client import CDispatch
+
+from .apartment import withEvents
+from .callbacks import dispatchCallback
+from .common import (
+    RefBool,
+    StopReason,
+    TestElementType,
+    Verdict,
+    waitAllFinished,
+    waitAnyFinished,
+    waitEventFinished,
+)
+from .comproperty import ComObject, ComProperty
 from .testtree import TestTreeElements
 from .testunit import TestUnits
 
@@ -13,92 +24,60 @@ LOG = logging.getLogger("VectorCOM")
 
 
 @rich.repr.auto
-class TestConfiguration:
+class TestConfiguration(ComObject):
     class _Events:
         OnStartCbk: Callable[..., None]
         OnStopCbk: Callable[[StopReason], None]
         OnVerdictChangedCbk: Callable[[Verdict], None]
         OnVerdictFailCbk: Callable[..., None]
-        OnStartFinished: RefBool = RefBool(True)
-        OnStopFinished: RefBool = RefBool(True)
-        OnVerdictChangedFinished: RefBool = RefBool(True)
-        OnVerdictFailFinished: RefBool = RefBool(True)
+        OnStartFinished: RefBool
+        OnStopFinished: RefBool
+        OnVerdictChangedFinished: RefBool
+        OnVerdictFailFinished: RefBool
+
+        def __init__(self):
+            self.OnStartFinished = RefBool(True)
+            self.OnStopFinished = RefBool(True)
+            self.OnVerdictChangedFinished = RefBool(True)
+            self.OnVerdictFailFinished = RefBool(True)
 
         def OnStart(self):
-            self.OnStartCbk()
             self.OnStartFinished.true
+            dispatchCallback(self.OnStartCbk)
 
         def OnStop(self, reason: StopReason):
-            self.OnStopCbk(reason)
             self.OnStopFinished.true
+            dispatchCallback(self.OnStopCbk, reason)
 
         def OnVerdictChanged(self, verdict: Verdict):
-            self.OnVerdictChangedCbk(verdict)
             self.OnVerdictChangedFinished.true
+            dispatchCallback(
+                self.OnVerdictChangedCbk, verdict, coalesceKey=(id(self), "verdict")
+            )
 
         def OnVerdictFail(self):
-            self.OnVerdictFailCbk()
             self.OnVerdictFailFinished.true
-
-    _com: CDispatch
-
-    @property
-    def Caption(self) -> Optional[str]:
-        try:
-            return self._com.Caption
-        except AttributeError as attr_e:
-            if attr_e.name == "Caption":
-                return None
-            raise
-
-    @property
-    def Elements(self) -> Optional[TestTreeElements]:
-        try:
-            return TestTreeElements(self._com.Elements)
-        except AttributeError as attr_e:
-            if attr_e.name == "Elements":
-                return None
-            raise
-
-    @property
-    def Enabled(self) -> str:
-        return self._com.Enabled
-
-    @property
-    def Id(self) -> Optional[str]:
-        try:
-            return self._com.Id
-        except AttributeError as attr_e:
-            if attr_e.name == "Id":
-                return None
-            raise
-
-    @property
-    def Name(self) -> str:
-        return self._com.Name
-
-    @property
-    def PortCreation(self) -> Optional[int]:
-        try:
-            return self._com.PortCreation
-        except AttributeError as attr_e:
-            if attr_e.name == "PortCreation":
-                return None
-            raise
+            dispatchCallback(self.OnVerdictFailCbk)
+
+    __slots__ = ("events",)
+
+    Caption = ComProperty[Optional[str]](optional=True)
+    Elements = ComProperty[Optional[TestTreeElements]](TestTreeElements, optional=True)
+    Enabled = ComProperty[bool]()
+    Id = ComProperty[Optional[str]](optional=True, cache=True)
+    Name = ComProperty[str]()
+    PortCreation = ComProperty[Optional[int]](optional=True)
+    Running = ComProperty[Optional[bool]](optional=True)
+    TestUnits = ComProperty(TestUnits)
+    Type = ComProperty[Optional[TestElementType]](
+        TestElementType, optional=True, cache=True
+    )
+    Verdict = ComProperty(Verdict)
 
     @property
     def Report(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def Running(self) -> bool:
-        try:
-            return self._com.Running
-        except AttributeError as attr_e:
-            if attr_e.name == "Running":
-                return None
-            raise
-
     @property
     def Settings(self) -> NotImplementedType:
         return NotImplemented
@@ -107,51 +86,59 @@ class TestConfiguration:
     def TcpIpStackSetting(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def TestUnits(self) -> TestUnits:
-        return TestUnits(self._com.TestUnits)
-
-    @property
-    def Type(self) -> Optional[TestElementType]:
-        try:
-            return TestElementType(self._com.Type)
-        except AttributeError as attr_e:
-            if attr_e.name == "Type":
-                return None
-            raise
-
-    @property
-    def Verdict(self) -> Verdict:
-        return Verdict(self._com.Verdict)
-
-    def Start(self):
+    def Start(self, wait: bool = True):
         if self.Running:
             return
-        self.events.OnStartFinished.false
-        self._com.Start()
-        waitEventFinished(self.events.OnStartFinished)
+        events = self.events
+        started, stopped = bool(events.OnStartFinished), bool(events.OnStopFinished)
+        # Cleared before Start(), the events may already fire while it runs.
+        events.OnStartFinished.false
+        events.OnStopFinished.false
+        try:
+            self._com.Start()
+        except BaseException:
+            # Nothing started, so waitAll()/waitAny() must not wait for it.
+            if started:
+                events.OnStartFinished.true
+            if stopped:
+                events.OnStopFinished.true
+            raise
+        if wait:
+            waitEventFinished(events.OnStartFinished)
 
     def Stop(self):
         if not self.Running:
             return
+        stopped = bool(self.events.OnStopFinished)
         self.events.OnStopFinished.false
-        self._com.Stop()
+        try:
+            self._com.Stop()
+        except BaseException:
+            if stopped:
+                self.events.OnStopFinished.true
+            raise
         waitEventFinished(self.events.OnStopFinished)
 
+    def waitFinished(self, timeout: float = 0) -> None:
+        waitEventFinished(self.events.OnStopFinished, timeout)
+
     def __init__(self, testcfg: CDispatch) -> None:
-        self._com = testcfg
-        self.events = WithEvents(testcfg, self._Events)
+        super().__init__(testcfg)
+        self.events = withEvents(testcfg, self._Events)
+        # Callbacks may run on executor threads that must not touch COM, so the
+        # default ones log a name read here instead of self.Name.
+        name = self.Name
         self.events.OnStartCbk = lambda: LOG.debug(
-            "Test Configuration %s started", self.Name
+            "Test Configuration %s started", name
         )
         self.events.OnStopCbk = lambda reason: LOG.debug(
-            "Test Configuration %s stopped with reason %s", self.Name, reason
+            "Test Configuration %s stopped with reason %s", name, reason
         )
         self.events.OnVerdictChangedCbk = lambda verdict: LOG.debug(
-            "Test Configuration %s verdict changed to %s", self.Name, verdict
+            "Test Configuration %s verdict changed to %s", name, verdict
         )
         self.events.OnVerdictFailCbk = lambda: LOG.debug(
-            "Test Configuration %s failed", self.Name
+            "Test Configuration %s failed", name
         )
 
     def __rich_repr__(self):
@@ -171,18 +158,45 @@ class TestConfiguration:
 
 
 @rich.repr.auto
-class TestConfigurations:
-    _COM: ClassVar[CDispatch]
+class TestConfigurations(ComObject):
+    __slots__ = ()
 
-    @property
-    def Count(self) -> int:
-        return self._COM.Count
+    Count = ComProperty[int]()
 
     def Item(self, index: int) -> TestConfiguration:
-        return TestConfiguration(self._COM.Item(index))
+        return TestConfiguration(self._com.Item(index))
+
+    def StartAll(
+        self, testcfgs: Iterable[TestConfiguration | int], timeout: float = 0
+    ) -> list[TestConfiguration]:
+        started = [
+            testcfg if isinstance(testcfg, TestConfiguration) else self.Item(testcfg)
+            for testcfg in testcfgs
+        ]
+        for testcfg in started:
+            testcfg.Start(wait=False)
+        waitAllFinished(
+            [testcfg.events.OnStartFinished for testcfg in started], timeout
+        )
+        return started
+
+    @staticmethod
+    def waitAll(testcfgs: Sequence[TestConfiguration], timeout: float = 0) -> None:
+        waitAllFinished(
+            [testcfg.events.OnStopFinished for testcfg in testcfgs], timeout
+        )
+
+    @staticmethod
+    def waitAny(
+        testcfgs: Sequence[TestConfiguration], timeout: float = 0
+    ) -> TestConfiguration:
+        index = waitAnyFinished(
+            [testcfg.events.OnStopFinished for testcfg in testcfgs], timeout
+        )
+        return testcfgs[index]
 
     def __init__(self, testcfgs: CDispatch) -> None:
-        self.__class__._COM = testcfgs
+        super().__init__(testcfgs)
 
     def __iter__(self):
         for i in range(1, self.Count + 1):
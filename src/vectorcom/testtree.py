@@ -4,46 +4,23 @@ import rich.repr
 from win32com.client import CDispatch
 
 from .common import TestElementType, Verdict
+from .comproperty import ComObject, ComProperty
 
 
 @rich.repr.auto
-class TestTreeElement:
-    _com: CDispatch
+class TestTreeElement(ComObject):
+    __slots__ = ()
 
-    @property
-    def Caption(self) -> str:
-        return self._com.Caption
-
-    @property
-    def Elements(self) -> TestTreeElements:
-        return TestTreeElements(self._com.Elements)
-
-    @property
-    def Enabled(self) -> bool:
-        return self._com.Enabled
-
-    @Enabled.setter
-    def Enabled(self, value: bool) -> None:
-        self._com.Enabled = value
-
-    @property
-    def Id(self) -> str:
-        return self._com.Id
-
-    @property
-    def Title(self) -> str:
-        return self._com.Title
-
-    @property
-    def Type(self) -> TestElementType:
-        return TestElementType(self._com.Type)
-
-    @property
-    def Verdict(self) -> Verdict:
-        return Verdict(self._com.Verdict)
+    Caption = ComProperty[str]()
+    Elements = ComProperty["TestTreeElements"](lambda com: TestTreeElements(com))
+    Enabled = ComProperty[bool](writable=True)
+    Id = ComProperty[str](cache=True)
+    Title = ComProperty[str]()
+    Type = ComProperty(TestElementType, cache=True)
+    Verdict = ComProperty(Verdict)
 
     def __init__(self, testtree: CDispatch) -> None:
-        self._com = testtree
+        super().__init__(testtree)
 
     def __rich_repr__(self):
         yield "Caption", self.Caption
@@ -56,18 +33,16 @@ class TestTreeElement:
 
 
 @rich.repr.auto
-class TestTreeElements:
-    _com: CDispatch
+class TestTreeElements(ComObject):
+    __slots__ = ()
 
-    @property
-    def Count(self) -> int:
-        return self._com.Count
+    Count = ComProperty[int]()
 
     def Item(self, index: int) -> TestTreeElement:
         return TestTreeElement(self._com.Item(index))
 
     def __init__(self, testtrees: CDispatch) -> None:
-        self._com = testtrees
+        super().__init__(testtrees)
 
     def __iter__(self):
         for i in range(1, self.Count + 1):
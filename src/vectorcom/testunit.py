@@ -5,71 +5,30 @@ import rich.repr
 from win32com.client import CDispatch
 
 from .common import TestElementType, Verdict
+from .comproperty import ComObject, ComProperty
 from .testtree import TestTreeElements
 
 
 @rich.repr.auto
-class TestUnit:
-    _com: CDispatch
+class TestUnit(ComObject):
+    __slots__ = ()
 
-    @property
-    def Caption(self) -> Optional[str]:
-        try:
-            return self._com.Caption
-        except AttributeError as attr_e:
-            if attr_e.name == "Caption":
-                return None
-            raise
-
-    @property
-    def Elements(self) -> Optional[TestTreeElements]:
-        try:
-            return TestTreeElements(self._com.Elements)
-        except AttributeError as attr_e:
-            if attr_e.name == "Elements":
-                return None
-            raise
-
-    @property
-    def Enabled(self) -> bool:
-        return self._com.Enabled
-
-    @Enabled.setter
-    def Enabled(self, value: bool) -> None:
-        self._com.Enabled = value
-
-    @property
-    def Id(self) -> Optional[str]:
-        try:
-            return self._com.Id
-        except AttributeError as attr_e:
-            if attr_e.name == "Id":
-                return None
-            raise
-
-    @property
-    def Name(self) -> str:
-        return self._com.Name
+    Caption = ComProperty[Optional[str]](optional=True)
+    Elements = ComProperty[Optional[TestTreeElements]](TestTreeElements, optional=True)
+    Enabled = ComProperty[bool](writable=True)
+    Id = ComProperty[Optional[str]](optional=True, cache=True)
+    Name = ComProperty[str]()
+    Type = ComProperty[Optional[TestElementType]](
+        TestElementType, optional=True, cache=True
+    )
+    Verdict = ComProperty(Verdict)
 
     @property
     def Report(self) -> NotImplementedType:
         return NotImplemented
 
-    @property
-    def Type(self) -> Optional[TestElementType]:
-        try:
-            return TestElementType(self._com.Type)
-        except AttributeError as attr_e:
-            if attr_e.name == "Type":
-                return None
-            raise
-
-    @property
-    def Verdict(self) -> Verdict:
-        return Verdict(self._com.Verdict)
-
     def __init__(self, testunit: CDispatch) -> None:
-        self._com = testunit
+        super().__init__(testunit)
 
     def __rich_repr__(self):
         yield "Caption", self.Caption
@@ -83,18 +42,16 @@ class TestUnit:
 
 
 @rich.repr.auto
-class TestUnits:
-    _com: CDispatch
+class TestUnits(ComObject):
+    __slots__ = ()
 
-    @property
-    def Count(self) -> int:
-        return self._com.Count
+    Count = ComProperty[int]()
 
     def Item(self, index: int) -> TestUnit:
         return TestUnit(self._com.Item(index))
 
     def __init__(self, testunits: CDispatch) -> None:
-        self._com = testunits
+        super().__init__(testunits)
 
     def __iter__(self):
         for i in range(1, self.Count + 1):
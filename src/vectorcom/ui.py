@@ -0,0 +1,259 @@
+import codecs
+import logging
+import os
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path as PLPath
+from time import perf_counter
+from typing import Callable, Optional, Sequence, Union
+
+import rich.repr
+from win32com.client import CDispatch
+
+from .apartment import ComProxy
+from .common import LatencyStats
+from .comproperty import ComObject, ComProperty
+
+LOG = logging.getLogger("VectorCOM")
+
+Sink = Callable[[Sequence[str]], None]
+
+# Complete lines at the end of the last read that are searched for again to
+# find where new output starts.
+TAIL_LINES = 8
+
+
+@rich.repr.auto
+class Write(ComObject):
+    __slots__ = ()
+
+    Text = ComProperty[str]()
+
+    def Clear(self) -> None:
+        self._com.Clear()
+
+    def Copy(self) -> None:
+        self._com.Copy()
+
+    def DisableOutputFile(self) -> None:
+        self._com.DisableOutputFile()
+
+    def EnableOutputFile(self, fullName: str, tabIndex: Optional[int] = None) -> None:
+        if tabIndex is None:
+            self._com.EnableOutputFile(fullName)
+        else:
+            self._com.EnableOutputFile(fullName, tabIndex)
+
+    def Output(self, text: str) -> None:
+        self._com.Output(text)
+
+    def __init__(self, write: CDispatch) -> None:
+        super().__init__(write)
+
+    def __rich_repr__(self):
+        yield "Text", self.Text
+
+
+@rich.repr.auto
+class UI(ComObject):
+    __slots__ = ()
+
+    Write = ComProperty(Write)
+
+    def __init__(self, ui: CDispatch) -> None:
+        super().__init__(ui)
+
+    def __rich_repr__(self):
+        yield self.Write
+
+
+def logSink(level: int = logging.INFO, logger: logging.Logger = LOG) -> Sink:
+    def sink(lines: Sequence[str]) -> None:
+        logger.log(level, "CANoe Write:\n%s", "\n".join(lines))
+
+    return sink
+
+
+class FileSink:
+    def __init__(self, path: Union[str, PLPath], encoding: str = "utf-8") -> None:
+        self.path = PLPath(path)
+        self._file = open(self.path, "a", encoding=encoding)
+
+    def __call__(self, lines: Sequence[str]) -> None:
+        self._file.write("".join(line + "\n" for line in lines))
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CaptureStats:
+    def __init__(self) -> None:
+        self.lines = 0
+        self.batches = 0
+        self.dropped = 0
+        self.comReads = 0
+        self.flushTime = LatencyStats()
+
+    def __repr__(self) -> str:
+        return (
+            f"CaptureStats(lines={self.lines}, batches={self.batches}, "
+            f"dropped={self.dropped}, comReads={self.comReads}, "
+            f"flushTime={self.flushTime!r})"
+        )
+
+
+class WriteCapture:
+    def __init__(
+        self,
+        write: Write,
+        sink: Optional[Sink] = None,
+        interval: float = 0.25,
+        batchSize: int = 500,
+        maxBuffer: int = 10_000,
+        outputFile: Optional[Union[str, PLPath]] = None,
+        poll: bool = False,
+        encoding: str = "utf-8",
+    ) -> None:
+        if poll and not isinstance(write._com, ComProxy):
+            raise ValueError(
+                "Polling the Write window from a background thread needs a Canoe "
+                "created with a ComApartment"
+            )
+        self.write = write
+        self.sink = sink or logSink()
+        self.interval = interval
+        self.batchSize = batchSize
+        self.poll = poll
+        self.encoding = encoding
+        self.stats = CaptureStats()
+        self.outputFile = None if outputFile is None else PLPath(outputFile)
+        self._ownsFile = False
+        self._buffer: deque[str] = deque(maxlen=maxBuffer)
+        self._partial = ""
+        self._offset = 0
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._seen = 0
+        self._tail: list[str] = []
+        self._partialSeen = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _readFile(self) -> str:
+        assert self.outputFile is not None
+        try:
+            with open(self.outputFile, "rb") as file:
+                file.seek(self._offset)
+                data = file.read()
+        except FileNotFoundError:
+            return ""
+        self._offset += len(data)
+        # The incremental decoder holds back a multibyte sequence split
+        # between two reads.
+        return self._decoder.decode(data)
+
+    def _mark(self, lines: list[str]) -> None:
+        self._seen = len(lines) - 1
+        self._tail = lines[max(self._seen - TAIL_LINES, 0) : self._seen]
+        self._partialSeen = len(lines[-1])
+
+    def _readText(self) -> str:
+        # Write.Text always returns the whole window, COM has no way to read
+        # just the new part, so every poll costs the full window size. Output
+        # file mode reads only what was appended.
+        lines = self.write.Text.replace("\r\n", "\n").split("\n")
+        self.stats.comReads += 1
+        size = len(self._tail)
+        start = None
+        # A full window only drops lines at the top, so the seen lines can only
+        # have moved up: search down from where they were and take the nearest
+        # match, a later repeat of the same lines is new output. Repeats that
+        # also scrolled out between two polls can still misplace the anchor.
+        for end in range(min(self._seen, len(lines) - 1), size - 1, -1):
+            if lines[end - size : end] == self._tail:
+                start = end
+                break
+        if start is None:
+            # The window was cleared, everything in it is new.
+            new = "\n".join(lines)
+        else:
+            new = "\n".join(lines[start:])[self._partialSeen :]
+        self._mark(lines)
+        return new
+
+    def _collect(self) -> None:
+        text = self._readText() if self.poll else self._readFile()
+        if not text:
+            return
+        lines = (self._partial + text).replace("\r\n", "\n").split("\n")
+        self._partial = lines.pop()
+        overflow = len(self._buffer) + len(lines) - (self._buffer.maxlen or 0)
+        if overflow > 0:
+            self.stats.dropped += overflow
+        self._buffer.extend(lines)
+
+    def _flush(self) -> None:
+        while self._buffer:
+            count = min(self.batchSize, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(count)]
+            start = perf_counter()
+            try:
+                self.sink(batch)
+            except Exception:
+                LOG.exception("Write window sink %r failed", self.sink)
+            self.stats.flushTime.record(perf_counter() - start)
+            self.stats.batches += 1
+            self.stats.lines += count
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._collect()
+            self._flush()
+        self._collect()
+        if self._partial:
+            self._buffer.append(self._partial)
+            self._partial = ""
+        self._flush()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Write window capture is already running")
+        if self.poll:
+            self._mark(self.write.Text.replace("\r\n", "\n").split("\n"))
+            self.stats.comReads += 1
+        else:
+            if self.outputFile is None:
+                fd, name = tempfile.mkstemp(prefix="vectorcom-write-", suffix=".txt")
+                os.close(fd)
+                self.outputFile = PLPath(name)
+                self._ownsFile = True
+            self._offset = (
+                self.outputFile.stat().st_size if self.outputFile.exists() else 0
+            )
+            self.write.EnableOutputFile(str(self.outputFile))
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="VectorCOM-write", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> CaptureStats:
+        if not self.poll:
+            self.write.DisableOutputFile()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._ownsFile and self.outputFile is not None:
+            self.outputFile.unlink(missing_ok=True)
+            self.outputFile, self._ownsFile = None, False
+        LOG.debug("%r", self.stats)
+        return self.stats
+
+    def __enter__(self) -> "WriteCapture":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,31 @@
+import rich.repr
+from win32com.client import CDispatch
+
+from .comproperty import ComObject, ComProperty
+
+
+@rich.repr.auto
+class UserFiles(ComObject):
+    __slots__ = ()
+
+    Count = ComProperty[int]()
+
+    def Item(self, index: int) -> str:
+        return self._com.Item(index)
+
+    def Add(self, fullName: str) -> None:
+        self._com.Add(fullName)
+
+    def Remove(self, index: int) -> None:
+        self._com.Remove(index)
+
+    def __init__(self, userfiles: CDispatch) -> None:
+        super().__init__(userfiles)
+
+    def __iter__(self):
+        for i in range(1, self.Count + 1):
+            yield self.Item(i)
+
+    def __rich_repr__(self):
+        yield "Count", self.Count
+        yield list(self)
@@ -2,35 +2,22 @@ import rich
 import rich.repr
 from win32com.client.dynamic import CDispatch
 
+from .comproperty import ComObject, ComProperty
 
-@rich.repr.auto
-class Version:
-    @property
-    def FullName(self) -> str:
-        return self._com.FullName
-
-    @property
-    def Name(self) -> str:
-        return self._com.Name
-
-    @property
-    def major(self) -> int:
-        return self._com.major
 
-    @property
-    def minor(self) -> int:
-        return self._com.minor
-
-    @property
-    def Build(self) -> int:
-        return self._com.Build
+@rich.repr.auto
+class Version(ComObject):
+    __slots__ = ()
 
-    @property
-    def Patch(self) -> int:
-        return self._com.Patch
+    FullName = ComProperty[str](cache=True)
+    Name = ComProperty[str](cache=True)
+    major = ComProperty[int](cache=True)
+    minor = ComProperty[int](cache=True)
+    Build = ComProperty[int](cache=True)
+    Patch = ComProperty[int](cache=True)
 
     def __init__(self, version: CDispatch) -> None:
-        self._com = version
+        super().__init__(version)
 
     def __rich_repr__(self):
         yield "FullName", self.FullName
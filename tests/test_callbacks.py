@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from vectorcom.callbacks import (
+    CallbackExecutor,
+    Overflow,
+    getCallbackExecutor,
+    setCallbackExecutor,
+)
+
+
+def blocked(overflow: Overflow, maxQueue: int = 2):
+    # The only worker waits on the gate, so everything else stays queued.
+    executor = CallbackExecutor(maxQueue, overflow)
+    gate, running = threading.Event(), threading.Event()
+
+    def hold() -> None:
+        running.set()
+        gate.wait(5)
+
+    executor.submit(hold)
+    assert running.wait(5)
+    return executor, gate
+
+
+def test_drop_oldest() -> None:
+    executor, gate = blocked(Overflow.DropOldest)
+    calls: list[int] = []
+    assert all(executor.submit(calls.append, value) for value in range(4))
+    gate.set()
+    executor.shutdown()
+    assert calls == [2, 3]
+    assert executor.metrics.dropped == 2
+    assert executor.metrics.maxQueueDepth == 2
+
+
+def test_drop_newest() -> None:
+    executor, gate = blocked(Overflow.DropNewest)
+    calls: list[int] = []
+    accepted = [executor.submit(calls.append, value) for value in range(4)]
+    gate.set()
+    executor.shutdown()
+    assert accepted == [True, True, False, False]
+    assert calls == [0, 1]
+    assert executor.metrics.dropped == 2
+
+
+def test_caller_runs() -> None:
+    executor, gate = blocked(Overflow.CallerRuns)
+    threads: list[str] = []
+    for _ in range(3):
+        executor.submit(lambda: threads.append(threading.current_thread().name))
+    assert threads == [threading.current_thread().name]
+    gate.set()
+    executor.shutdown()
+    assert len(threads) == 3
+    assert executor.metrics.dropped == 0
+
+
+def test_block_waits_for_room() -> None:
+    executor, gate = blocked(Overflow.Block, maxQueue=1)
+    calls: list[int] = []
+    executor.submit(calls.append, 0)
+    submitter = threading.Thread(target=executor.submit, args=(calls.append, 1))
+    submitter.start()
+    submitter.join(0.2)
+    assert submitter.is_alive()
+    gate.set()
+    submitter.join(5)
+    executor.shutdown()
+    assert calls == [0, 1]
+
+
+def test_coalesce_keeps_latest_arguments() -> None:
+    executor, gate = blocked(Overflow.DropNewest)
+    calls: list[int] = []
+    for value in range(5):
+        executor.submit(calls.append, value, coalesceKey="verdict")
+    gate.set()
+    executor.shutdown()
+    assert calls == [4]
+    assert executor.metrics.coalesced == 4
+
+
+def test_failures_are_counted() -> None:
+    with CallbackExecutor() as executor:
+        executor.submit(lambda: 1 / 0)
+    assert executor.metrics.failed == 1
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+def test_block_is_rejected_for_com_events() -> None:
+    executor = CallbackExecutor(overflow=Overflow.Block)
+    try:
+        with pytest.raises(ValueError):
+            setCallbackExecutor(executor)
+        assert getCallbackExecutor() is None
+    finally:
+        executor.shutdown()
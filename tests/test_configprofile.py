@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+pytest.importorskip("win32com.client")
+
+from vectorcom.comproperty import ComObject  # noqa: E402
+from vectorcom.configprofile import ConfigurationProfile  # noqa: E402
+from vectorcom.configuration import CfgFDXTL, CfgMode, Configuration  # noqa: E402
+
+
+class FakeConfigurationCom:
+    def __init__(self) -> None:
+        self.writes: list[str] = []
+        self.values = {
+            "Mode": 0,
+            "FDXEnabled": False,
+            "FDXPort": 2809,
+            "FDXTransportLayer": 1,
+            "Comment": "",
+        }
+
+    def __getattr__(self, name: str):
+        try:
+            return self.__dict__["values"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in ("writes", "values"):
+            object.__setattr__(self, name, value)
+            return
+        self.writes.append(name)
+        self.values[name] = value
+        if name == "Mode":
+            # Switching the mode resets the FDX port, like CANoe may do.
+            self.values["FDXPort"] = 2809
+
+
+def configuration(com: FakeConfigurationCom) -> Configuration:
+    # Skips __init__, which would connect a COM event sink to the fake.
+    wrapper = Configuration.__new__(Configuration)
+    ComObject.__init__(wrapper, com)
+    return wrapper
+
+
+def test_rejects_unknown_and_read_only() -> None:
+    with pytest.raises(ValueError):
+        ConfigurationProfile({"Missing": 1})
+    with pytest.raises(ValueError):
+        ConfigurationProfile({"FullName": "x.cfg"})
+
+
+def test_coerces_enums_and_orders_leading_first() -> None:
+    profile = ConfigurationProfile(
+        {"FDXPort": 3000, "FDXTransportLayer": "FDXTL_TCP_IPv4", "Mode": 1}
+    )
+    assert profile.values["Mode"] is CfgMode.Offline
+    assert profile.values["FDXTransportLayer"] is CfgFDXTL.FDXTL_TCP_IPv4
+    assert profile.order == ["Mode", "FDXTransportLayer", "FDXPort"]
+
+
+def test_diff_lists_only_changes() -> None:
+    com = FakeConfigurationCom()
+    profile = ConfigurationProfile({"Mode": "Online", "FDXPort": 3000, "Comment": ""})
+    assert profile.diff(configuration(com)) == {"FDXPort": (2809, 3000)}
+    assert com.writes == []
+
+
+def test_apply_compares_again_after_leading_writes() -> None:
+    com = FakeConfigurationCom()
+    com.values["FDXPort"] = 3000
+    profile = ConfigurationProfile({"Mode": "Offline", "FDXPort": 3000})
+    result = profile.apply(configuration(com))
+    assert com.writes == ["Mode", "FDXPort"]
+    assert result.changes == {
+        "Mode": (CfgMode.Online, CfgMode.Offline),
+        "FDXPort": (2809, 3000),
+    }
+    assert not profile.apply(configuration(com)).changed
+
+
+def test_from_file(tmp_path) -> None:
+    toml = tmp_path / "profile.toml"
+    toml.write_text('Mode = "Offline"\nFDXEnabled = true\n', encoding="utf-8")
+    profile = ConfigurationProfile.fromFile(toml)
+    assert profile.values == {"Mode": CfgMode.Offline, "FDXEnabled": True}
+    data = tmp_path / "profile.json"
+    data.write_text(json.dumps({"FDXPort": 3000}), encoding="utf-8")
+    assert ConfigurationProfile.fromFile(data).values == {"FDXPort": 3000}
+    with pytest.raises(ValueError):
+        ConfigurationProfile.fromFile(tmp_path / "profile.ini")
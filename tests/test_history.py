@@ -0,0 +1,62 @@
+from vectorcom.common import Verdict
+from vectorcom.history import ResultHistory
+
+PASSED = Verdict.VerdictPassed
+FAILED = Verdict.VerdictFailed
+NOT_RUN = Verdict.VerdictNotAvailable
+
+
+def ingest(history: ResultHistory, verdicts, testcfg: str = "tests") -> list[int]:
+    return [
+        history.ingestResults(
+            "rig.cfg", testcfg, [("tc", "case", verdict)], {"tc": float(index)}
+        )
+        for index, verdict in enumerate(verdicts, 1)
+    ]
+
+
+def test_flakiness_counts_outcome_changes() -> None:
+    history = ResultHistory()
+    ingest(history, [PASSED, FAILED, NOT_RUN, FAILED, PASSED])
+    ingest(history, [PASSED, PASSED], "stable")
+    flaky, stable = history.flakiness()
+    assert (flaky.testcfg, flaky.runs, flaky.failures) == ("tests", 4, 2)
+    assert flaky.transitions == 2
+    assert flaky.flakiness == 2 / 3
+    assert (stable.testcfg, stable.flakiness, stable.failureRate) == ("stable", 0, 0)
+
+
+def test_min_runs() -> None:
+    history = ResultHistory()
+    ingest(history, [FAILED])
+    assert history.flakiness() == []
+    assert len(history.flakiness(minRuns=1)) == 1
+
+
+def test_compact_keeps_statistics() -> None:
+    history = ResultHistory()
+    verdicts = [PASSED, FAILED, PASSED, PASSED, FAILED, FAILED, PASSED]
+    ingest(history, verdicts)
+    before = history.flakiness()[0]
+    transitions = history.transitions("rig.cfg", "tests", "tc")
+    durations = history.meanDurations()
+    assert history.compact(keepRuns=2, batch=3) == 3
+    assert history.compact(keepRuns=2, batch=3) == 2
+    assert history.compact(keepRuns=2) == 0
+    after = history.flakiness()[0]
+    assert (after.runs, after.failures, after.transitions) == (
+        before.runs,
+        before.failures,
+        before.transitions,
+    )
+    assert history.transitions("rig.cfg", "tests", "tc") == transitions
+    assert history.meanDurations() == durations
+
+
+def test_transitions_across_the_compaction_boundary() -> None:
+    history = ResultHistory()
+    runs = ingest(history, [PASSED, PASSED])
+    history.compact(keepRuns=0)
+    runs += ingest(history, [FAILED])
+    assert history.transitions("rig.cfg", "tests", "tc") == [(runs[2], PASSED, FAILED)]
+    assert history.flakiness()[0].transitions == 1
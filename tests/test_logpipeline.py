@@ -0,0 +1,101 @@
+import gzip
+import json
+
+import pytest
+
+from vectorcom import logpipeline
+from vectorcom.logpipeline import BLF_HEADER, LogPipeline, indexLog, processLog
+
+START = (2024, 5, 2, 14, 9, 30, 15, 250)
+# An unset SYSTEMTIME, as left behind by a logging block that did not stop.
+STOP = (0,) * 8
+
+
+def blfHeader(signature: bytes = b"LOGG") -> bytes:
+    return BLF_HEADER.pack(
+        signature,
+        BLF_HEADER.size,
+        *(5, 17, 0, 2, 4, 1, 0, 0),
+        4096,
+        8192,
+        42,
+        0,
+        *START,
+        *STOP,
+    )
+
+
+def ascLog(events: int) -> bytes:
+    lines = [b"date Thu May 2 02:09:30.250 pm 2024", b"base hex  timestamps absolute"]
+    lines += [
+        b"   %.6f 1  123             Rx   d 8 00 00 00 00 00 00 00 00" % (index / 10)
+        for index in range(1, events + 1)
+    ]
+    lines.append(b"End TriggerBlock")
+    return b"\r\n".join(lines) + b"\r\n"
+
+
+def test_index_blf(tmp_path) -> None:
+    path = tmp_path / "run.blf"
+    path.write_bytes(blfHeader() + b"\0" * 100)
+    index = indexLog(path)
+    assert index["format"] == "blf"
+    assert index["size"] == BLF_HEADER.size + 100
+    assert index["application"] == [5, 17, 0, 2]
+    assert (index["uncompressedSize"], index["objectCount"]) == (8192, 42)
+    assert index["start"] == "2024-05-14T09:30:15.250000"
+    assert index["stop"] is None
+
+
+def test_index_blf_rejects_other_files(tmp_path) -> None:
+    path = tmp_path / "run.blf"
+    path.write_bytes(blfHeader(b"BLOB"))
+    with pytest.raises(ValueError):
+        indexLog(path)
+    path.write_bytes(b"LOGG")
+    with pytest.raises(ValueError):
+        indexLog(path)
+
+
+def test_index_asc(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "run.asc"
+    path.write_bytes(ascLog(2000))
+    # The last timestamp must come from the tail, not a full read.
+    monkeypatch.setattr(logpipeline, "ASC_TAIL", 512)
+    index = indexLog(path)
+    assert index["date"] == "Thu May 2 02:09:30.250 pm 2024"
+    assert (index["first"], index["last"]) == (0.1, 200.0)
+
+
+def test_index_asc_single_event(tmp_path) -> None:
+    path = tmp_path / "run.asc"
+    path.write_bytes(ascLog(1))
+    index = indexLog(path)
+    assert (index["first"], index["last"]) == (0.1, 0.1)
+
+
+def test_process_log_compresses(tmp_path) -> None:
+    path = tmp_path / "run.asc"
+    data = ascLog(100)
+    path.write_bytes(data)
+    index = processLog(path)
+    assert not path.exists()
+    with gzip.open(index["compressed"], "rb") as file:
+        assert file.read() == data
+    assert index["compressedSize"] < index["size"] == len(data)
+
+
+def test_pipeline_writes_index(tmp_path) -> None:
+    (tmp_path / "a.asc").write_bytes(ascLog(10))
+    (tmp_path / "b.blf").write_bytes(blfHeader())
+    (tmp_path / "notes.txt").write_text("not a log", encoding="utf-8")
+    index_path = tmp_path / "index.jsonl"
+    with LogPipeline(workers=2, indexPath=index_path) as pipeline:
+        futures = pipeline.submitRun(tmp_path)
+        for future in futures:
+            future.result(30)
+    assert len(futures) == 2
+    metrics = pipeline.metrics
+    assert (metrics.completed, metrics.failed, metrics.queueDepth) == (2, 0, 0)
+    lines = index_path.read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["format"] for line in lines) == ["asc", "blf"]
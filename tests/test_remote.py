@@ -0,0 +1,256 @@
+import socket
+import threading
+import unittest
+from enum import IntEnum
+from pathlib import PurePath
+
+from vectorcom import remote
+from vectorcom.common import Verdict
+from vectorcom.comproperty import ComObject, ComProperty
+from vectorcom.remote import RemoteClient, RemoteError, RemoteServer
+
+
+class CfgMode(IntEnum):
+    Online = 0
+    Offline = 1
+
+
+class FakeModuleCom:
+    def __init__(self, name: str) -> None:
+        self.Name = name
+        self.Verdict = int(Verdict.VerdictPassed)
+
+
+class FakeModulesCom:
+    def __init__(self) -> None:
+        self.modules: list[FakeModuleCom] = []
+        self.adds = 0
+
+    @property
+    def Count(self) -> int:
+        return len(self.modules)
+
+
+class FakeConfigurationCom:
+    def __init__(self, name: str) -> None:
+        self.Name = name
+        self.FullName = f"C:/configs/{name}"
+        self.Mode = 0
+        self.TestModules = FakeModulesCom()
+
+
+class FakeCanoeCom:
+    def __init__(self) -> None:
+        self.configurations = 0
+        self.current = FakeConfigurationCom("first.cfg")
+
+    @property
+    def Configuration(self) -> FakeConfigurationCom:
+        self.configurations += 1
+        return self.current
+
+
+class Module(ComObject):
+    __slots__ = ()
+
+    Name = ComProperty[str](writable=True)
+    Verdict = ComProperty(Verdict)
+
+
+class ModuleList(ComObject):
+    __slots__ = ()
+
+    Count = ComProperty[int]()
+
+    def Item(self, index: int) -> Module:
+        return Module(self._com.modules[index - 1])
+
+    def Add(self, name: str) -> Module:
+        self._com.adds += 1
+        self._com.modules.append(FakeModuleCom(name))
+        return Module(self._com.modules[-1])
+
+
+class Configuration(ComObject):
+    __slots__ = ()
+
+    Name = ComProperty[str]()
+    FullName = ComProperty(PurePath)
+    Mode = ComProperty(CfgMode, writable=True)
+    TestModules = ComProperty(ModuleList)
+
+
+class Canoe(ComObject):
+    __slots__ = ("notExported",)
+
+    Configuration = ComProperty(Configuration)
+
+    def __init__(self, com: FakeCanoeCom) -> None:
+        super().__init__(com)
+        self.notExported = "slot"
+
+    def Open(self, path: str) -> None:
+        self._com.current = FakeConfigurationCom(path)
+
+
+class RemoteTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.com = FakeCanoeCom()
+        self.canoe = Canoe(self.com)
+        self.server = RemoteServer(self.canoe, port=0).start()
+        self.client = RemoteClient(port=self.server.port, timeout=5)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_get_and_call(self) -> None:
+        root = self.client.root
+        self.assertEqual(root.Configuration.Name, "first.cfg")
+        modules = root.Configuration.TestModules
+        modules.Add("a")
+        modules.Add("b")
+        self.assertEqual([module.Name for module in modules], ["a", "b"])
+        self.assertEqual(modules[2].Verdict, Verdict.VerdictPassed)
+
+    def test_set_enum(self) -> None:
+        self.com.current.Mode = 1
+        configuration = self.client.root.Configuration
+        configuration.Mode = 0
+        self.assertEqual(self.com.current.Mode, 0)
+
+    def test_registered_enums_decode(self) -> None:
+        previous = remote.ENUMS.get("CfgMode")
+        remote.registerEnums(CfgMode)
+        try:
+            mode = self.client.root.Configuration.Mode
+        finally:
+            if previous is None:
+                del remote.ENUMS["CfgMode"]
+            else:
+                remote.registerEnums(previous)
+        self.assertIs(mode, CfgMode.Online)
+
+    def test_remote_error(self) -> None:
+        with self.assertRaises(RemoteError) as caught:
+            self.client.root.Missing
+        self.assertEqual(caught.exception.kind, "AttributeError")
+        with self.assertRaises(RemoteError):
+            self.client.get(("_com",))
+
+    def test_only_wrappers_are_exported(self) -> None:
+        path = self.client.root.Configuration.FullName
+        self.assertEqual(path, PurePath("C:/configs/first.cfg"))
+        for request in (
+            ("Configuration", "FullName", ("unlink", ())),
+            ("Configuration", "FullName", ("write_text", ("x",))),
+            ("Configuration", "FullName", "parent"),
+            ("Configuration", ("invalidate", ())),
+            ("Configuration", "Name", ("upper", ())),
+            ("notExported",),
+            ("__class__",),
+        ):
+            with self.subTest(request=request):
+                with self.assertRaises(RemoteError):
+                    self.client.get(request)
+
+    def test_only_writable_properties_are_set(self) -> None:
+        with self.assertRaises(RemoteError):
+            self.client.root.Configuration.Name = "other.cfg"
+        with self.assertRaises(RemoteError):
+            self.client.root.notExported = "other"
+        self.assertEqual(self.com.current.Name, "first.cfg")
+
+    def test_batch(self) -> None:
+        values = self.client.root.Configuration.read("Name", "Missing")
+        self.assertEqual(values["Name"], "first.cfg")
+        self.assertIsInstance(values["Missing"], RemoteError)
+
+    def test_wrappers_cached_per_connection(self) -> None:
+        configuration = self.client.root.Configuration
+        configuration.Name
+        configuration.TestModules.Count
+        self.assertEqual(self.com.configurations, 1)
+        self.client.get(("Configuration", "Name"))
+        self.assertEqual(self.com.configurations, 1)
+
+    def test_values_are_not_cached(self) -> None:
+        modules = self.client.root.Configuration.TestModules
+        self.assertEqual(modules.Count, 0)
+        self.com.current.TestModules.modules.append(FakeModuleCom("a"))
+        self.assertEqual(modules.Count, 1)
+
+    def test_returned_object_is_not_called_again(self) -> None:
+        module = self.client.root.Configuration.TestModules.Add("a")
+        module.Name = "renamed"
+        self.assertEqual(module.Name, "renamed")
+        self.assertEqual(self.com.current.TestModules.adds, 1)
+
+    def test_invalidate(self) -> None:
+        self.assertEqual(self.client.root.Configuration.Name, "first.cfg")
+        self.client.root.Open("second.cfg")
+        self.assertEqual(self.client.get(("Configuration", "Name")), "first.cfg")
+        self.server.invalidate()
+        self.assertEqual(self.client.get(("Configuration", "Name")), "second.cfg")
+
+    def test_error_without_id(self) -> None:
+        errors: list[RemoteError] = []
+        received = threading.Event()
+
+        def onError(exc: RemoteError) -> None:
+            errors.append(exc)
+            received.set()
+
+        self.client.onError = onError
+        self.client._sock.sendall(b"not json\n")
+        self.assertTrue(received.wait(5))
+        self.assertEqual(errors[0].kind, "ValueError")
+        self.assertTrue(self.client.connected)
+        self.assertEqual(self.client.root.Configuration.Name, "first.cfg")
+
+    def test_events(self) -> None:
+        received = threading.Event()
+        self.client.subscribe("Measurement.OnStart", lambda: received.set())
+        self.server.notify("Measurement.OnStart")
+        self.assertTrue(received.wait(5))
+
+    def test_event_handler_can_call_back(self) -> None:
+        names: list[str] = []
+        received = threading.Event()
+
+        def handler() -> None:
+            names.append(self.client.root.Configuration.Name)
+            received.set()
+
+        self.client.subscribe("Measurement.OnStart", handler)
+        self.server.notify("Measurement.OnStart")
+        self.assertTrue(received.wait(5))
+        self.assertEqual(names, ["first.cfg"])
+
+
+class DisconnectTest(unittest.TestCase):
+    def test_send_after_disconnect(self) -> None:
+        with socket.create_server(("127.0.0.1", 0)) as listener:
+            client = RemoteClient(port=listener.getsockname()[1], timeout=5)
+            connection, _ = listener.accept()
+            connection.close()
+            client._reader.join(5)
+            self.assertFalse(client.connected)
+            with self.assertRaises(ConnectionError):
+                client.get(())
+            client.close()
+
+    def test_pending_fail_on_disconnect(self) -> None:
+        with socket.create_server(("127.0.0.1", 0)) as listener:
+            client = RemoteClient(port=listener.getsockname()[1], timeout=5)
+            connection, _ = listener.accept()
+            future = client.getAsync(())
+            connection.recv(4096)
+            connection.close()
+            with self.assertRaises(ConnectionError):
+                future.result(5)
+            client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from vectorcom.common import Verdict
+from vectorcom.history import ResultHistory
+from vectorcom import sharding
+from vectorcom.sharding import (
+    ResultNode,
+    applyShard,
+    elementDurations,
+    mergeResults,
+    planShards,
+)
+
+
+class Elements(list):
+    @property
+    def Count(self) -> int:
+        return len(self)
+
+
+class Element:
+    def __init__(self, id: str, enabled: bool = True, children=()) -> None:
+        self.Id = id
+        self.Title = f"title {id}"
+        self.Enabled = enabled
+        self.Elements = Elements(children)
+
+
+class Unit:
+    def __init__(self, id: str, elements) -> None:
+        self.Id = id
+        self.Name = f"unit {id}"
+        self.Enabled = True
+        self.Elements = elements
+
+
+class FakeTestConfiguration:
+    Id = "cfg"
+    Name = "tests"
+
+    def __init__(self, units) -> None:
+        self.TestUnits = units
+
+
+def test_plan_balances_durations() -> None:
+    durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 1.0}
+    shards = planShards(list(durations), durations, 2)
+    assert sorted(shard.estimated for shard in shards) == [8.0, 8.0]
+    assert sorted(case for shard in shards for case in shard.cases) == list("abcde")
+
+
+def test_plan_uses_median_for_unknown_cases() -> None:
+    shards = planShards(["a", "b", "new"], {"a": 1.0, "b": 3.0}, 2)
+    assert sorted(shard.estimated for shard in shards) == [3.0, 3.0]
+
+
+def test_plan_from_history_durations() -> None:
+    history = ResultHistory()
+    passed = Verdict.VerdictPassed
+    for _ in range(3):
+        history.ingestResults(
+            "rig.cfg",
+            "tests",
+            [("slow", "", passed), ("fast1", "", passed), ("fast2", "", passed)],
+            {"slow": 10.0, "fast1": 5.0, "fast2": 5.0},
+        )
+        # The same Ids in another test configuration must not leak in.
+        history.ingestResults(
+            "rig.cfg", "other", [("fast1", "", passed)], {"fast1": 100.0}
+        )
+    durations = elementDurations(history.meanDurations(), "rig.cfg", "tests")
+    assert durations == {"slow": 10.0, "fast1": 5.0, "fast2": 5.0}
+    shards = planShards(["slow", "fast1", "fast2"], durations, 2)
+    assert sorted(sorted(shard.cases) for shard in shards) == [
+        ["fast1", "fast2"],
+        ["slow"],
+    ]
+
+
+def test_tree_and_apply_agree_on_leaves() -> None:
+    group = Element("g", children=[Element("c1", False), Element("c2", False)])
+    testcfg = FakeTestConfiguration(
+        [Unit("u", Elements([group, Element("c3"), Element("")]))]
+    )
+    assert [leaf.elementId for leaf in sharding.testTree(testcfg).leaves()] == ["c3"]
+    previous = applyShard(testcfg, ["c1"])
+    assert previous == {"c1": False, "c2": False, "c3": True}
+    assert [element.Enabled for element in group.Elements] == [True, False]
+    applyShard(testcfg, previous)
+    assert [element.Enabled for element in group.Elements] == [False, False]
+
+
+def test_merge_takes_worst_verdict() -> None:
+    root = ResultNode("cfg", "tests")
+    unit = ResultNode("u", "unit")
+    root.children.append(unit)
+    unit.children += [ResultNode("a", "a"), ResultNode("b", "b")]
+    mergeResults(root, [{"a": Verdict.VerdictPassed}, {"b": Verdict.VerdictFailed}])
+    assert root.verdict is Verdict.VerdictFailed
+    assert [leaf.shard for leaf in root.leaves()] == [0, 1]
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("pythoncom")
+
+from vectorcom.sweep import (  # noqa: E402
+    SweepJob,
+    countSwitches,
+    countTransitions,
+    planSweep,
+)
+
+
+def jobs(*specs: tuple[int, str]) -> list[SweepJob]:
+    return [
+        SweepJob(hardware, mapping, f"tc{index}")
+        for index, (hardware, mapping) in enumerate(specs)
+    ]
+
+
+def test_plan_keeps_every_job() -> None:
+    queue = jobs((1, "a"), (2, "b"), (1, "b"), (2, "a"), (1, "a"), (3, "c"))
+    plan = planSweep(queue)
+    assert sorted(plan) == sorted(queue)
+    assert countSwitches(plan) <= countSwitches(queue)
+
+
+def test_plan_groups_hardware_then_mapping() -> None:
+    plan = planSweep(jobs((1, "a"), (2, "a"), (1, "b"), (1, "a")))
+    assert [(job.hardware, job.channelMapping) for job in plan] == [
+        (1, "b"),
+        (1, "a"),
+        (1, "a"),
+        (2, "a"),
+    ]
+    # The mapping the next hardware needs is kept across the switch.
+    assert countTransitions(plan) == {"hardware": 1, "mapping": 1, "combined": 1}
+
+
+def test_plan_starts_from_active_state() -> None:
+    plan = planSweep(jobs((1, "a"), (2, "b"), (2, "a")), start=(2, "a"))
+    assert [(job.hardware, job.channelMapping) for job in plan] == [
+        (2, "a"),
+        (2, "b"),
+        (1, "a"),
+    ]
+    assert countSwitches(plan, start=(2, "a")) == (1, 2)
+
+
+def test_count_transitions() -> None:
+    plan = jobs((1, "a"), (1, "b"), (2, "b"), (3, "c"))
+    assert countTransitions(plan, start=(1, "a")) == {
+        "hardware": 1,
+        "mapping": 1,
+        "combined": 1,
+    }
+    assert countSwitches(plan, start=(1, "a")) == (2, 2)